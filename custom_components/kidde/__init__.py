@@ -1,39 +1,70 @@
 """The Kidde HomeSafe integration."""
+
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from kidde_homesafe import KiddeClient
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import KiddeCoordinator
+from .const import DOMAIN, RATE_BUDGET_CAPACITY, RATE_BUDGET_PER_MINUTE
+from .services import async_setup_services
 
-PLATFORMS: list[Platform] = [
-    Platform.SWITCH,
-    Platform.BUTTON,
-    Platform.SENSOR,
-    Platform.BINARY_SENSOR,
-]
+if TYPE_CHECKING:
+    from .account import KiddeAccount
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Kidde HomeSafe services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Kidde HomeSafe from a config entry."""
+    # Deferred so loading the integration does not import the API client
+    from kidde_homesafe import KiddeClient
+
+    from .account import KiddeAccount
+    from .ratelimit import KiddeRateBudget
 
     hass.data.setdefault(DOMAIN, {})
     client = KiddeClient(entry.data["cookies"])
-    hass.data[DOMAIN][entry.entry_id] = coordinator = KiddeCoordinator(
-        hass, client, update_interval=entry.data["update_interval"]
-    )
-    await coordinator.async_refresh()
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    budget = KiddeRateBudget(hass, RATE_BUDGET_CAPACITY, RATE_BUDGET_PER_MINUTE)
+    account = KiddeAccount(hass, entry, client, budget)
+    # Also runs when setup fails, so a retried setup starts clean
+    entry.async_on_unload(account.async_shutdown)
+    await account.async_setup()
+    hass.data[DOMAIN][entry.entry_id] = account
+
+    await hass.config_entries.async_forward_entry_setups(entry, account.platforms)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    account: KiddeAccount = hass.data[DOMAIN][entry.entry_id]
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, account.platforms
+    ):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a removed config entry."""
+    from .analytics import async_remove_trends
+
+    await async_remove_trends(hass, entry.entry_id)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
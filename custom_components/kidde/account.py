@@ -0,0 +1,420 @@
+"""Account level manager for Kidde HomeSafe."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+import async_timeout
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+from kidde_homesafe import KiddeClient, KiddeClientAuthError
+
+from .analytics import KiddeTrends
+from .const import (
+    BASE_PLATFORMS,
+    CONF_COMPACT_ENTITIES,
+    CONF_IGNORE_LAST_SEEN,
+    CONF_SHARD_LOCATIONS,
+    DOMAIN,
+    FINGERPRINT_IGNORED_KEYS,
+    KEY_PLATFORMS,
+    LOCATION_REFRESH_INTERVAL,
+    MODEL_PLATFORMS,
+    REFRESH_TIMEOUT,
+)
+from .coordinator import KiddeCoordinator, async_get_locations
+from .latency import KiddeAlarmLatency
+from .profiler import KiddeProfiler
+from .ratelimit import KiddePriority, KiddeRateBudget
+from .trace import KiddeTraceRecorder
+
+# Creates the entities of a platform for a device of a coordinator
+DeviceEntitiesFactory = Callable[[KiddeCoordinator, int, dict], list[Entity]]
+
+logger = logging.getLogger(__name__)
+
+
+class KiddeAccount:
+    """Manager for the coordinators of a Kidde account.
+
+    The account owns the client and the rate budget shared by its coordinators.
+    There is a single coordinator for the whole account, or one per location when
+    the account is sharded, so a slow or failing location only affects its own
+    entities.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: KiddeClient,
+        budget: KiddeRateBudget,
+    ) -> None:
+        """Initialize the account."""
+        self.hass = hass
+        self.entry = entry
+        self.client = client
+        self.budget = budget
+        self.alarm_latency = KiddeAlarmLatency()
+        self.trends = KiddeTrends(hass, entry.entry_id)
+        # Only create safety-critical entities and a diagnostics sensor per device
+        self.compact: bool = entry.options.get(CONF_COMPACT_ENTITIES, False)
+        # Coordinators keyed by location ID, or None for the whole account
+        self.coordinators: dict[int | None, KiddeCoordinator] = {}
+        # Platforms forwarded for the devices discovered so far
+        self.platforms: set[Platform] = set()
+        # Number of device entities created
+        self.entity_count = 0
+        # Devices that entities have been created for, per coordinator
+        self._devices: dict[int | None, set[int]] = {}
+        # Device entities created, per coordinator
+        self._entities: dict[int | None, list[Entity]] = {}
+        # Removes the account's listener from each coordinator
+        self._unsub_coordinators: dict[int | None, CALLBACK_TYPE] = {}
+        # Cancels the periodic location check of a sharded account
+        self._cancel_location_refresh: CALLBACK_TYPE | None = None
+        self._entity_factories: list[
+            tuple[AddEntitiesCallback, DeviceEntitiesFactory]
+        ] = []
+        self._trace: KiddeTraceRecorder | None = None
+        self._cancel_trace: CALLBACK_TYPE | None = None
+        self._profiler: KiddeProfiler | None = None
+
+    def _create_coordinator(self, location: dict | None = None) -> KiddeCoordinator:
+        """Create the coordinator of a location, or of the whole account."""
+        return KiddeCoordinator(
+            self.hass,
+            self.client,
+            self.budget,
+            self.alarm_latency,
+            self.trends,
+            self.entry.data["update_interval"],
+            location,
+            FINGERPRINT_IGNORED_KEYS
+            if self.entry.options.get(CONF_IGNORE_LAST_SEEN, False)
+            else frozenset(),
+        )
+
+    async def async_setup(self) -> None:
+        """Create the coordinators and run their first refresh."""
+        await self.trends.async_load()
+
+        if not self.entry.options.get(CONF_SHARD_LOCATIONS, False):
+            coordinator = self._create_coordinator()
+            await coordinator.async_config_entry_first_refresh()
+            self.coordinators[None] = coordinator
+        else:
+            locations = await self._async_get_locations()
+            self.coordinators = {
+                location_id: self._create_coordinator(location)
+                for location_id, location in locations.items()
+            }
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh()
+                    for coordinator in self.coordinators.values()
+                )
+            )
+            if self.coordinators and not any(
+                coordinator.last_update_success
+                for coordinator in self.coordinators.values()
+            ):
+                raise ConfigEntryNotReady("No Kidde location could be refreshed")
+
+        for key, coordinator in self.coordinators.items():
+            self._devices[key] = (
+                set(coordinator.data.devices) if coordinator.data else set()
+            )
+            self._async_listen(key, coordinator)
+        self.platforms = self.required_platforms()
+
+        if self.entry.options.get(CONF_SHARD_LOCATIONS, False):
+            self._cancel_location_refresh = async_track_time_interval(
+                self.hass,
+                self._async_refresh_locations,
+                dt.timedelta(seconds=LOCATION_REFRESH_INTERVAL),
+            )
+
+        if all(
+            coordinator.last_update_success for coordinator in self.coordinators.values()
+        ):
+            self.trends.async_prune(
+                {
+                    device_id
+                    for coordinator in self.coordinators.values()
+                    for device_id in coordinator.data.devices
+                }
+            )
+
+    async def async_shutdown(self) -> None:
+        """Release everything the account holds when its entry is unloaded.
+
+        The client opens a new connection for every request, so it holds nothing
+        to close.
+        """
+        if self._cancel_location_refresh:
+            self._cancel_location_refresh()
+            self._cancel_location_refresh = None
+        if (profiler := self._async_detach_profiler()) and profiler.profiled:
+            await self._async_write_profile(profiler)
+        await self.async_stop_trace()
+        for unsub in self._unsub_coordinators.values():
+            unsub()
+        self._unsub_coordinators.clear()
+        for coordinator in self.coordinators.values():
+            await coordinator.async_shutdown()
+        self.budget.async_shutdown()
+        await self.trends.async_shutdown()
+        self._entity_factories.clear()
+        self._entities.clear()
+
+    @callback
+    def async_add_device_entities(
+        self, async_add_entities: AddEntitiesCallback, factory: DeviceEntitiesFactory
+    ) -> None:
+        """Add a platform's entities for current and later discovered devices."""
+        self._entity_factories.append((async_add_entities, factory))
+        entities = []
+        for key in self.coordinators:
+            entities.extend(
+                self._async_create_entities(key, factory, self._devices[key])
+            )
+        async_add_entities(entities)
+
+    @callback
+    def _async_create_entities(
+        self, key: int | None, factory: DeviceEntitiesFactory, device_ids: set[int]
+    ) -> list[Entity]:
+        """Create a platform's entities for devices of a coordinator."""
+        coordinator = self.coordinators[key]
+        entities = [
+            entity
+            for device_id in device_ids
+            for entity in factory(
+                coordinator, device_id, coordinator.data.devices[device_id]
+            )
+        ]
+        self._entities.setdefault(key, []).extend(entities)
+        self.entity_count += len(entities)
+        return entities
+
+    async def async_record_trace(self, duration: dt.timedelta) -> Path:
+        """Record the refreshes of every coordinator to a trace file."""
+        await self.async_stop_trace()
+
+        stamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        path = Path(
+            self.hass.config.path(f"kidde_trace_{self.entry.entry_id}_{stamp}.jsonl.gz")
+        )
+        locations = sum(
+            len(coordinator.data.locations)
+            for coordinator in self.coordinators.values()
+            if coordinator.data
+        )
+        self._trace = KiddeTraceRecorder(
+            self.hass, path, locations, self.entry.data["update_interval"]
+        )
+        for coordinator in self.coordinators.values():
+            coordinator.trace = self._trace
+        self._cancel_trace = async_call_later(
+            self.hass, duration, self._async_trace_finished
+        )
+        logger.info("Recording Kidde trace to %s for %s", path, duration)
+        return path
+
+    async def async_stop_trace(self) -> None:
+        """Stop recording a trace and write it to disk."""
+        if self._trace is None:
+            return
+        if self._cancel_trace:
+            self._cancel_trace()
+            self._cancel_trace = None
+        for coordinator in self.coordinators.values():
+            coordinator.trace = None
+        trace, self._trace = self._trace, None
+        await trace.async_close()
+        logger.info("Recorded %s Kidde refreshes to %s", trace.refreshes, trace.path)
+
+    async def _async_trace_finished(self, _now: dt.datetime) -> None:
+        """Stop recording once the trace duration has passed."""
+        self._cancel_trace = None
+        await self.async_stop_trace()
+
+    @property
+    def profile_path(self) -> Path | None:
+        """Return the report file of the running profile, if any."""
+        return self._profiler.path if self._profiler else None
+
+    @callback
+    def async_profile(self, refreshes: int) -> Path:
+        """Profile the next refreshes of the coordinators to a report file."""
+        if self._profiler is not None:
+            raise HomeAssistantError(
+                f"Already profiling Kidde refreshes to {self._profiler.path}"
+            )
+
+        stamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        path = Path(
+            self.hass.config.path(f"kidde_profile_{self.entry.entry_id}_{stamp}.txt")
+        )
+        self._profiler = KiddeProfiler(path, refreshes, self._async_profile_finished)
+        for coordinator in self.coordinators.values():
+            coordinator.profiler = self._profiler
+        logger.info("Profiling the next %s Kidde refreshes to %s", refreshes, path)
+        return path
+
+    @callback
+    def _async_profile_finished(self) -> None:
+        """Detach the profiler and write its report."""
+        if (profiler := self._async_detach_profiler()) and profiler.profiled:
+            self.entry.async_create_task(self.hass, self._async_write_profile(profiler))
+
+    @callback
+    def _async_detach_profiler(self) -> KiddeProfiler | None:
+        """Detach the profiler from the coordinators and return it."""
+        profiler, self._profiler = self._profiler, None
+        for coordinator in self.coordinators.values():
+            coordinator.profiler = None
+        return profiler
+
+    async def _async_write_profile(self, profiler: KiddeProfiler) -> None:
+        """Write a profile report in the executor."""
+        await self.hass.async_add_executor_job(profiler.write_report)
+        logger.info(
+            "Wrote profile of %s Kidde refreshes to %s",
+            profiler.profiled,
+            profiler.path,
+        )
+
+    def required_platforms(self) -> set[Platform]:
+        """Return the platforms needed by the devices on the account."""
+        platforms = set(BASE_PLATFORMS)
+        if self.compact:
+            return platforms
+        for coordinator in self.coordinators.values():
+            if not coordinator.data:
+                continue
+            for device in coordinator.data.devices.values():
+                platforms |= MODEL_PLATFORMS.get(device.get("model"), frozenset())
+                platforms.update(
+                    platform for key, platform in KEY_PLATFORMS.items() if key in device
+                )
+        return platforms
+
+    async def _async_get_locations(self) -> dict[int, dict]:
+        """Fetch the locations to shard the account by."""
+        await self.budget.acquire(KiddePriority.POLL)
+        try:
+            async with async_timeout.timeout(REFRESH_TIMEOUT):
+                return await async_get_locations(self.client)
+        except KiddeClientAuthError as e:
+            raise ConfigEntryAuthFailed from e
+        except Exception as e:
+            raise ConfigEntryNotReady(
+                f"{type(e).__name__} while communicating with API: {e}"
+            ) from e
+
+    @callback
+    def _async_coordinator_updated(self, key: int | None) -> None:
+        """Set up platforms and entities for newly discovered devices."""
+        coordinator = self.coordinators[key]
+        if not coordinator.last_update_success:
+            return
+
+        if self.required_platforms() - self.platforms:
+            self.entry.async_create_task(self.hass, self._async_forward_new_platforms())
+
+        if new_devices := coordinator.data.devices.keys() - self._devices[key]:
+            logger.debug("New Kidde devices discovered: %s", new_devices)
+            self._devices[key] |= new_devices
+            for async_add_entities, factory in self._entity_factories:
+                async_add_entities(
+                    self._async_create_entities(key, factory, new_devices)
+                )
+
+    @callback
+    def _async_listen(self, key: int | None, coordinator: KiddeCoordinator) -> None:
+        """Listen for the refreshes of a coordinator."""
+        self._unsub_coordinators[key] = coordinator.async_add_listener(
+            partial(self._async_coordinator_updated, key)
+        )
+
+    async def _async_refresh_locations(self, _now: dt.datetime) -> None:
+        """Add and retire the coordinators of a sharded account's locations.
+
+        A failed check is left to the next one; the coordinators report their
+        own failures.
+        """
+        try:
+            locations = await self._async_get_locations()
+        except (ConfigEntryAuthFailed, ConfigEntryNotReady) as e:
+            logger.debug("Failed to check for new Kidde locations: %s", e)
+            return
+        if self._cancel_location_refresh is None:
+            # Unloaded while fetching
+            return
+
+        for location_id in self.coordinators.keys() - locations.keys():
+            await self._async_retire_coordinator(location_id)
+        for location_id, location in locations.items():
+            if (coordinator := self.coordinators.get(location_id)) is not None:
+                coordinator.location = location
+                continue
+            logger.info("New Kidde location discovered: %s", location_id)
+            coordinator = self._create_coordinator(location)
+            coordinator.trace = self._trace
+            coordinator.profiler = self._profiler
+            self.coordinators[location_id] = coordinator
+            self._devices[location_id] = set()
+            self._async_listen(location_id, coordinator)
+            await coordinator.async_refresh()
+
+    async def _async_retire_coordinator(self, location_id: int) -> None:
+        """Stop refreshing a removed location and remove its entities.
+
+        The entities stay in the entity registry, so they keep their settings
+        if the location comes back.
+        """
+        logger.info("Kidde location removed: %s", location_id)
+        coordinator = self.coordinators.pop(location_id)
+        self._unsub_coordinators.pop(location_id)()
+        self._devices.pop(location_id)
+        coordinator.trace = coordinator.profiler = None
+        await coordinator.async_shutdown()
+        entities = self._entities.pop(location_id, [])
+        self.entity_count -= len(entities)
+        for entity in entities:
+            if entity.hass is not None:
+                await entity.async_remove()
+
+    async def _async_forward_new_platforms(self) -> None:
+        """Set up platforms that are needed after the config entry was loaded."""
+        # ConfigEntry.setup_lock replaced reload_lock in Home Assistant 2024.4
+        lock = getattr(self.entry, "setup_lock", None) or self.entry.reload_lock
+        async with lock:
+            if (
+                self.entry.state is not ConfigEntryState.LOADED
+                or self.hass.data[DOMAIN].get(self.entry.entry_id) is not self
+            ):
+                # Unloaded, or reloaded with a new account, while waiting
+                return
+            if new_platforms := self.required_platforms() - self.platforms:
+                await self.hass.config_entries.async_forward_entry_setups(
+                    self.entry, new_platforms
+                )
+                self.platforms |= new_platforms
@@ -0,0 +1,171 @@
+"""Incremental trends of Kidde HomeSafe device values for predictive maintenance."""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections import deque
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    TREND_KEYS,
+    TREND_MIN_SAMPLES,
+    TREND_SAMPLE_INTERVAL,
+    TREND_SAVE_DELAY,
+    TREND_SIZE,
+)
+
+STORAGE_VERSION = 1
+
+DAY = 24 * 60 * 60
+
+
+def _storage_key(entry_id: str) -> str:
+    """Return the storage key of the trends of a config entry."""
+    return f"{DOMAIN}.{entry_id}.trends"
+
+
+async def async_remove_trends(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored trends of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
+
+
+class KiddeTrend:
+    """Least squares line through a rolling, downsampled series of a value.
+
+    Samples are at least TREND_SAMPLE_INTERVAL apart and only the last TREND_SIZE
+    are kept. The regression sums are updated as samples are added and evicted,
+    so every update is O(1). Times are in days since the first sample, which
+    keeps the sums small.
+    """
+
+    def __init__(self, origin: float) -> None:
+        """Initialize an empty trend starting at a timestamp."""
+        self.origin = origin
+        self.samples: deque[tuple[float, float]] = deque()
+        self._sum_t = 0.0
+        self._sum_v = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+
+    def add(self, timestamp: float, value: float) -> bool:
+        """Add a sample, returning False if it is too soon after the last one."""
+        t = (timestamp - self.origin) / DAY
+        if self.samples and (t - self.samples[-1][0]) * DAY < TREND_SAMPLE_INTERVAL:
+            return False
+        if len(self.samples) >= TREND_SIZE:
+            self._update(*self.samples.popleft(), -1)
+        self.samples.append((t, value))
+        self._update(t, value, 1)
+        return True
+
+    def predict(self, target: float) -> dt.datetime | None:
+        """Return when the trend is predicted to fall to the target value."""
+        n = len(self.samples)
+        if n < TREND_MIN_SAMPLES:
+            return None
+        denominator = n * self._sum_tt - self._sum_t**2
+        if denominator <= 0:
+            return None
+        slope = (n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+        if slope >= 0:
+            return None
+        intercept = (self._sum_v - slope * self._sum_t) / n
+        days = (target - intercept) / slope
+        try:
+            return dt_util.utc_from_timestamp(self.origin + days * DAY)
+        except (OverflowError, OSError, ValueError):
+            # Too far in the future to represent
+            return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trend for storage."""
+        return {"origin": self.origin, "samples": list(self.samples)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> KiddeTrend:
+        """Restore a stored trend."""
+        trend = cls(data["origin"])
+        for t, value in data["samples"][-TREND_SIZE:]:
+            trend.samples.append((t, value))
+            trend._update(t, value, 1)
+        return trend
+
+    def _update(self, t: float, value: float, sign: int) -> None:
+        """Add a sample to, or remove it from, the regression sums."""
+        self._sum_t += sign * t
+        self._sum_v += sign * value
+        self._sum_tt += sign * t * t
+        self._sum_tv += sign * t * value
+
+
+class KiddeTrends:
+    """Trends of the devices of an account, persisted across restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the trends."""
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        self._trends: dict[int, dict[str, KiddeTrend]] = {}
+        self._unsaved = False
+
+    async def async_load(self) -> None:
+        """Load the stored trends."""
+        data = await self._store.async_load() or {}
+        self._trends = {
+            int(device_id): {
+                key: KiddeTrend.from_dict(trend)
+                for key, trend in trends.items()
+                if key in TREND_KEYS
+            }
+            for device_id, trends in data.items()
+        }
+
+    @callback
+    def async_add(self, device_id: int, device: dict, timestamp: float) -> None:
+        """Add the normalized values of a device to its trends."""
+        added = False
+        for key in TREND_KEYS:
+            if (value := device.get(key)) is None:
+                continue
+            trends = self._trends.setdefault(device_id, {})
+            if (trend := trends.get(key)) is None:
+                trend = trends[key] = KiddeTrend(timestamp)
+            added |= trend.add(timestamp, value)
+        if added:
+            self._unsaved = True
+            self._store.async_delay_save(self._data_to_save, TREND_SAVE_DELAY)
+
+    @callback
+    def async_prune(self, device_ids: set[int]) -> None:
+        """Forget the trends of devices that are no longer on the account."""
+        if removed := self._trends.keys() - device_ids:
+            for device_id in removed:
+                del self._trends[device_id]
+            self._unsaved = True
+            self._store.async_delay_save(self._data_to_save, TREND_SAVE_DELAY)
+
+    def predict(self, device_id: int, key: str) -> dt.datetime | None:
+        """Return when a device's value is predicted to reach its end."""
+        if (trend := self._trends.get(device_id, {}).get(key)) is None:
+            return None
+        return trend.predict(TREND_KEYS[key])
+
+    async def async_shutdown(self) -> None:
+        """Save trends that are waiting for a delayed save."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the trends for storage."""
+        self._unsaved = False
+        return {
+            str(device_id): {key: trend.as_dict() for key, trend in trends.items()}
+            for device_id, trends in self._trends.items()
+        }
@@ -4,151 +4,84 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.components.binary_sensor import (
-    BinarySensorDeviceClass,
-    BinarySensorEntity,
-    BinarySensorEntityDescription,
-)
+from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    EntityCategory,
-)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .account import KiddeAccount
+from .const import ALARM_KEYS, DOMAIN, SAFETY_KEYS
 from .coordinator import KiddeCoordinator
+from .descriptions.binary_sensor import (
+    BATTERY_SENSOR_DESCRIPTIONS,
+    BINARY_SENSOR_DESCRIPTIONS,
+    INVERSE_BINARY_SENSOR_DESCRIPTIONS,
+)
 from .entity import KiddeEntity
 
 # Constants for dictionary keys
 KEY_MODEL = "model"
+KEY_LAST_SEEN = "last_seen"
 
 logger = logging.getLogger(__name__)
 
 
-_BINARY_SENSOR_DESCRIPTIONS = (
-    BinarySensorEntityDescription(
-        key="smoke_alarm",
-        icon="mdi:smoke-detector-variant-alert",
-        name="Smoke Alarm",
-        device_class=BinarySensorDeviceClass.SMOKE,
-    ),
-    BinarySensorEntityDescription(
-        key="smoke_hushed",
-        icon="mdi:smoke-detector-variant-off",
-        name="Smoke Hushed",
-    ),
-    BinarySensorEntityDescription(
-        key="co_alarm",
-        icon="mdi:molecule-co",
-        name="CO Alarm",
-        device_class=BinarySensorDeviceClass.CO,
-    ),
-    BinarySensorEntityDescription(
-        key="hardwire_smoke",
-        icon="mdi:smoke-detector-variant-alert",
-        name="Hardwire Smoke Alarm",
-        device_class=BinarySensorDeviceClass.SMOKE,
-    ),
-    BinarySensorEntityDescription(
-        key="too_much_smoke",
-        icon="mdi:smoke-detector-variant-alert",
-        name="Too Much Smoke",
-        entity_category=EntityCategory.DIAGNOSTIC,
-        device_class=BinarySensorDeviceClass.SMOKE,
-    ),
-    BinarySensorEntityDescription(
-        key="contact_lost",
-        icon="mdi:smoke-detector-variant-off",
-        name="Contact Lost",
-    ),
-    BinarySensorEntityDescription(
-        key="lost",
-        icon="mdi:smoke-detector-variant-off",
-        name="Lost",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    BinarySensorEntityDescription(
-        key="water_alarm",
-        icon="mdi:water-alert",
-        name="Water Alert",
-    ),
-    BinarySensorEntityDescription(
-        key="low_temp_alarm",
-        icon="mdi:snowflake-alert",
-        name="Freeze Alert",
-    ),
-    BinarySensorEntityDescription(
-        key="low_battery_alarm",
-        icon="mdi:battery-alert-variant",
-        name="Battery Low Alert",
-    ),
-    BinarySensorEntityDescription(
-        key="reset_flag",
-        icon="mdi:history",
-        name="Reset Flag",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-)
-
-_INVERSE_BINARY_SENSOR_DESCRIPTIONS = (
-    BinarySensorEntityDescription(
-        key="offline",
-        icon="mdi:wifi-alert",
-        name="Online",
-        device_class=BinarySensorDeviceClass.CONNECTIVITY,
-    ),
-)
-
-_BATTERY_SENSOR_DESCRIPTIONS = (
-    BinarySensorEntityDescription(
-        key="battery_state",
-        icon="mdi:battery",
-        name="Battery State",
-        device_class=BinarySensorDeviceClass.BATTERY,
-    ),
-)
-
-
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
 ) -> None:
     """Set up the binary sensor platform."""
-    coordinator: KiddeCoordinator = hass.data[DOMAIN][entry.entry_id]
+    account: KiddeAccount = hass.data[DOMAIN][entry.entry_id]
+    account.async_add_device_entities(
+        async_add_devices,
+        _device_compact_binary_sensors if account.compact else _device_binary_sensors,
+    )
+
+
+def _device_binary_sensors(
+    coordinator: KiddeCoordinator, device_id: int, device_data: dict
+) -> list[BinarySensorEntity]:
+    """Create the binary sensors of a device."""
     sensors: list[BinarySensorEntity] = []
 
-    for device_id, device_data in coordinator.data.devices.items():
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(
-                "Checking model: [%s]",
-                coordinator.data.devices[device_id].get(KEY_MODEL, "Unknown"),
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checking model: [%s]", device_data.get(KEY_MODEL, "Unknown"))
+
+    for entity_description in BINARY_SENSOR_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            entity_class = (
+                KiddeAlarmBinarySensorEntity
+                if entity_description.key in ALARM_KEYS
+                else KiddeBinarySensorEntity
             )
+            sensors.append(entity_class(coordinator, device_id, entity_description))
 
-        for entity_description in _BINARY_SENSOR_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                sensors.append(
-                    KiddeBinarySensorEntity(coordinator, device_id, entity_description)
+    for entity_description in INVERSE_BINARY_SENSOR_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            sensors.append(
+                KiddeInverseBinarySensorEntity(
+                    coordinator, device_id, entity_description
                 )
+            )
 
-        for entity_description in _INVERSE_BINARY_SENSOR_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                sensors.append(
-                    KiddeInverseBinarySensorEntity(
-                        coordinator, device_id, entity_description
-                    )
-                )
+    for entity_description in BATTERY_SENSOR_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            sensors.append(
+                KiddeBatteryStateSensorEntity(coordinator, device_id, entity_description)
+            )
 
-        for entity_description in _BATTERY_SENSOR_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                sensors.append(
-                    KiddeBatteryStateSensorEntity(
-                        coordinator, device_id, entity_description
-                    )
-                )
+    return sensors
 
-    # NOTE: It is possible that sensors is an empty list. Is that OK?
 
-    async_add_devices(sensors)
+def _device_compact_binary_sensors(
+    coordinator: KiddeCoordinator, device_id: int, device_data: dict
+) -> list[BinarySensorEntity]:
+    """Create the safety-critical binary sensors of a device for compact mode."""
+    return [
+        sensor
+        for sensor in _device_binary_sensors(coordinator, device_id, device_data)
+        if sensor.entity_description.key in SAFETY_KEYS
+    ]
 
 
 class KiddeBinarySensorEntity(KiddeEntity, BinarySensorEntity):
@@ -160,6 +93,34 @@ class KiddeBinarySensorEntity(KiddeEntity, BinarySensorEntity):
         return self.kidde_device.get(self.entity_description.key)
 
 
+class KiddeAlarmBinarySensorEntity(KiddeBinarySensorEntity):
+    """Alarm binary sensor that measures how late alarms are written."""
+
+    _alarm_on = False
+
+    async def async_added_to_hass(self) -> None:
+        """Ignore an alarm that is already on when the entity is added."""
+        await super().async_added_to_hass()
+        self._alarm_on = bool(self.is_on)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Record the latency of an alarm once its state has been written."""
+        super()._handle_coordinator_update()
+        alarm_on = bool(self.is_on)
+        if (
+            alarm_on
+            and not self._alarm_on
+            and (last_seen := self.kidde_device.get(KEY_LAST_SEEN))
+        ):
+            self.coordinator.alarm_latency.async_record(
+                self.device_id,
+                self.entity_description.key,
+                (dt_util.utcnow() - last_seen).total_seconds(),
+            )
+        self._alarm_on = alarm_on
+
+
 class KiddeInverseBinarySensorEntity(KiddeEntity, BinarySensorEntity):
     """Binary sensor for Kidde HomeSafe."""
 
@@ -0,0 +1,56 @@
+"""Bounded in-memory capture of Kidde API payloads for diagnostics."""
+
+from __future__ import annotations
+
+import json
+import time
+import zlib
+from collections import deque
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+from kidde_homesafe import KiddeDataset
+
+
+class KiddePayloadCapture:
+    """Ring buffer of the most recent KiddeDataset payloads.
+
+    Payloads are kept as zlib compressed JSON so the capture is cheap enough to
+    leave enabled. They are only decoded when diagnostics are downloaded.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        """Initialize the capture buffer."""
+        self._payloads: deque[tuple[float, bytes]] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        """Return the number of captured payloads."""
+        return len(self._payloads)
+
+    @property
+    def size(self) -> int:
+        """Return the number of compressed bytes held by the buffer."""
+        return sum(len(blob) for _, blob in self._payloads)
+
+    def add(self, dataset: KiddeDataset) -> None:
+        """Capture a dataset returned by the API."""
+        raw = json.dumps(
+            {
+                "locations": dataset.locations,
+                "devices": dataset.devices,
+                "events": dataset.events,
+            },
+            separators=(",", ":"),
+            default=str,
+        )
+        self._payloads.append((time.time(), zlib.compress(raw.encode(), 1)))
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the captured payloads, oldest first."""
+        return [
+            {
+                "captured_at": dt_util.utc_from_timestamp(captured_at).isoformat(),
+                "payload": json.loads(zlib.decompress(blob)),
+            }
+            for captured_at, blob in self._payloads
+        ]
@@ -6,11 +6,17 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from kidde_homesafe import KiddeClient, KiddeClientAuthError
 
-from .const import DOMAIN
+from .const import (
+    CONF_COMPACT_ENTITIES,
+    CONF_IGNORE_LAST_SEEN,
+    CONF_SHARD_LOCATIONS,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +34,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return KiddeOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -57,3 +69,37 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+
+class KiddeOptionsFlow(OptionsFlow):
+    """Handle the options of a Kidde HomeSafe config entry."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SHARD_LOCATIONS,
+                    default=options.get(CONF_SHARD_LOCATIONS, False),
+                ): bool,
+                vol.Required(
+                    CONF_COMPACT_ENTITIES,
+                    default=options.get(CONF_COMPACT_ENTITIES, False),
+                ): bool,
+                vol.Required(
+                    CONF_IGNORE_LAST_SEEN,
+                    default=options.get(CONF_IGNORE_LAST_SEEN, False),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -1,4 +1,90 @@
 """Constants for the Kidde HomeSafe integration."""
 
+from homeassistant.const import Platform
+
 DOMAIN = "kidde"
 MANUFACTURER = "Kidde"
+# The entry title holds the account email, which must not end up in entity IDs
+ACCOUNT_DEVICE_NAME = "Kidde HomeSafe account"
+
+CONF_SHARD_LOCATIONS = "shard_locations"
+CONF_COMPACT_ENTITIES = "compact_entities"
+CONF_IGNORE_LAST_SEEN = "ignore_last_seen"
+
+# Seconds a single API request of a refresh may take before it fails
+REFRESH_TIMEOUT = 10
+# Interval at which a sharded account checks for added or removed locations,
+# in seconds
+LOCATION_REFRESH_INTERVAL = 15 * 60
+# Number of locations whose devices are fetched concurrently
+MAX_PARALLEL_FETCHES = 4
+
+# Number of raw API payloads kept in memory for diagnostics downloads
+CAPTURE_SIZE = 10
+# Number of refresh timings kept in memory for diagnostics downloads
+POLL_HISTORY_SIZE = 100
+
+# Payload keys redacted from diagnostics downloads and traces
+TO_REDACT = {
+    "cookies",
+    "email",
+    "password",
+    "serial_number",
+    "ssid",
+}
+
+# Number of refreshes buffered in memory before a trace is written to disk
+TRACE_FLUSH_LINES = 20
+
+# Size of the per account request budget, in requests
+RATE_BUDGET_CAPACITY = 20
+# Rate at which the per account request budget refills, in requests per minute
+RATE_BUDGET_PER_MINUTE = 30
+# Minimum time between state writes of the API budget sensor, in seconds
+RATE_BUDGET_SENSOR_COOLDOWN = 300
+
+# Relative accuracy of the alarm latency percentiles
+LATENCY_RELATIVE_ACCURACY = 0.05
+# Number of buckets each alarm latency distribution is bounded to
+LATENCY_MAX_BUCKETS = 128
+
+# Battery voltage at which a detector's battery is predicted to be depleted
+BATTERY_DEPLETED_VOLTAGE = 2.6
+# Device keys whose trend is tracked, with the value at which the trend ends:
+# no weeks of life left, or a depleted battery
+TREND_KEYS = {
+    "life": 0.0,
+    "batt_volt": BATTERY_DEPLETED_VOLTAGE,
+    "battery_voltage": BATTERY_DEPLETED_VOLTAGE,
+}
+# Minimum time between the samples of a trend, in seconds
+TREND_SAMPLE_INTERVAL = 6 * 60 * 60
+# Number of samples kept per device and key, covering a month at 6 hours apart
+TREND_SIZE = 120
+# Number of samples needed before a trend is used for predictions
+TREND_MIN_SAMPLES = 8
+# Delay before trends are saved after a new sample, in seconds
+TREND_SAVE_DELAY = 15 * 60
+
+# Device keys left out of the payload fingerprint when the ignore last seen
+# option is set, so a refresh in which only these change is skipped
+FINGERPRINT_IGNORED_KEYS = frozenset({"last_seen"})
+
+# Device keys that indicate an active alarm
+ALARM_KEYS = ("smoke_alarm", "co_alarm", "hardwire_smoke", "water_alarm")
+# Device keys that keep their own entity in compact mode
+SAFETY_KEYS = (*ALARM_KEYS, "low_temp_alarm", "low_battery_alarm", "offline")
+
+# Platforms set up for every account; each device has sensors and binary sensors
+BASE_PLATFORMS = frozenset({Platform.SENSOR, Platform.BINARY_SENSOR})
+# Additional platforms needed by a device, keyed by its model
+MODEL_PLATFORMS: dict[str, frozenset[Platform]] = {
+    "wifiiaqdetector": frozenset({Platform.BUTTON}),
+    "wifidetector": frozenset({Platform.BUTTON}),
+    "cowifidetector": frozenset(),
+    "waterleakdetector": frozenset(),
+}
+# Additional platforms needed by a device, keyed by a key in its payload
+KEY_PLATFORMS: dict[str, Platform] = {
+    "identifying": Platform.SWITCH,
+}
@@ -1,7 +1,14 @@
 """DataUpdateCoordinator for Kidde Homesafe integration."""
 
+import asyncio
+import dataclasses
+import hashlib
+import json
 import logging
+import time
+from collections import Counter, deque
 from datetime import timedelta
+from typing import Any
 
 import async_timeout
 from homeassistant.core import HomeAssistant
@@ -9,36 +16,296 @@ from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from kidde_homesafe import KiddeClient, KiddeClientAuthError, KiddeDataset
 
-from .const import DOMAIN
+from .analytics import KiddeTrends
+from .capture import KiddePayloadCapture
+from .const import (
+    ALARM_KEYS,
+    CAPTURE_SIZE,
+    DOMAIN,
+    MAX_PARALLEL_FETCHES,
+    POLL_HISTORY_SIZE,
+    REFRESH_TIMEOUT,
+)
+from .latency import KiddeAlarmLatency
+from .normalize import KiddeNormalizer, KiddePayloadError
+from .profiler import KiddeProfiler
+from .ratelimit import KiddePriority, KiddeRateBudget
+from .trace import KiddeTraceRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _dict_by_ids(items: list[dict]) -> dict[int, dict]:
+    """Create a dictionary from a list of items, keyed by ID."""
+    result = {item["id"]: item for item in items}
+    if len(result) != len(items):
+        counts = Counter(item["id"] for item in items)
+        duplicates = [item for item in items if counts[item["id"]] > 1]
+        raise ValueError(f"Duplicate IDs: {duplicates}")
+    return result
+
+
+async def async_get_locations(client: KiddeClient) -> dict[int, dict]:
+    """Fetch the locations of the account, keyed by ID."""
+    # kidde_homesafe only exposes per-location requests through _request
+    return _dict_by_ids(await client._request("location"))
+
+
+async def async_get_location_devices(
+    client: KiddeClient, location_id: int
+) -> dict[int, dict]:
+    """Fetch the devices of a location, keyed by ID."""
+    return _dict_by_ids(await client._request(f"location/{location_id}/device"))
+
+
+def _fingerprint(device: dict, ignored_keys: frozenset[str]) -> bytes:
+    """Return a cheap fingerprint of a device's payload, without ignored keys."""
+    if ignored_keys:
+        device = {key: value for key, value in device.items() if key not in ignored_keys}
+    raw = json.dumps(device, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=8).digest()
+
+
 class KiddeCoordinator(DataUpdateCoordinator):
-    """Coordinator for Kidde HomeSafe."""
+    """Coordinator for Kidde HomeSafe.
+
+    Covers every location of the account, or a single location when the
+    account is sharded by location.
+    """
 
     data: KiddeDataset
 
     def __init__(
-        self, hass: HomeAssistant, client: KiddeClient, update_interval: int
+        self,
+        hass: HomeAssistant,
+        client: KiddeClient,
+        budget: KiddeRateBudget,
+        alarm_latency: KiddeAlarmLatency,
+        trends: KiddeTrends,
+        update_interval: int,
+        location: dict | None = None,
+        fingerprint_ignored_keys: frozenset[str] = frozenset(),
     ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
+            name=DOMAIN if location is None else f"{DOMAIN} location {location['id']}",
             update_interval=timedelta(seconds=update_interval),
+            always_update=False,
         )
         self.client = client
+        self.budget = budget
+        self.alarm_latency = alarm_latency
+        self.trends = trends
+        self.location = location
+        self.capture = KiddePayloadCapture(CAPTURE_SIZE)
+        self.normalizer = KiddeNormalizer()
+        self.counters: Counter[str] = Counter()
+        # Raw devices of each location from its last successful fetch
+        self._location_devices: dict[int, dict[int, dict]] = {}
+        # Consecutive failed fetches of each location that is currently failing
+        self.failed_locations: dict[int, int] = {}
+        # Locations that started failing or recovered in the last fetch
+        self._locations_toggled: set[int] = set()
+        # Device keys whose changes alone do not make a device changed
+        self.fingerprint_ignored_keys = fingerprint_ignored_keys
+        # Payload fingerprints of the devices in the last accepted refresh
+        self._fingerprints: dict[int, bytes] = {}
+        # Devices whose payload changed in the last accepted refresh
+        self.changed_devices: set[int] = set()
+        # Recorder of the refreshes while a trace is being recorded
+        self.trace: KiddeTraceRecorder | None = None
+        # Profiler of the next refreshes while profiling is requested
+        self.profiler: KiddeProfiler | None = None
+        # (start timestamp, duration in seconds, success) of recent refreshes
+        self.poll_history: deque[tuple[float, float, bool]] = deque(
+            maxlen=POLL_HISTORY_SIZE
+        )
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data and update listeners, profiling them if requested."""
+        if (profiler := self.profiler) is None or not profiler.async_start():
+            await super()._async_refresh(*args, **kwargs)
+            return
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            profiler.async_stop()
 
     async def _async_update_data(self) -> KiddeDataset:
         """Fetch data from API endpoint."""
+        if self.location is None:
+            # One request for the locations plus one per location for its devices
+            cost = 1 + (len(self.data.locations) if self.data else 1)
+        else:
+            cost = 1
+        priority = KiddePriority.URGENT if self.alarm_active else KiddePriority.POLL
+        await self.budget.acquire(priority, cost)
+
+        started = time.time()
+        start = time.monotonic()
+        self.counters["refreshes"] += 1
         try:
-            async with async_timeout.timeout(10):
-                return await self.client.get_data(get_events=False)
+            data = await self._async_fetch()
         except KiddeClientAuthError as e:
+            self._fingerprints = {}
+            self._record_poll(started, start, False)
+            self.counters["auth_failures"] += 1
             raise ConfigEntryAuthFailed from e
         except Exception as e:
+            self._fingerprints = {}
+            self._record_poll(started, start, False)
+            self.counters["failures"] += 1
             raise UpdateFailed(
                 f"{type(e).__name__} while communicating with API: {e}"
             ) from e
+
+        self._record_poll(started, start, True)
+        try:
+            self.normalizer.validate(data)
+        except KiddePayloadError as e:
+            self.capture.add(data)
+            self._fingerprints = {}
+            self.counters["rejected_payloads"] += 1
+            raise UpdateFailed(f"Rejected API payload: {e}") from e
+
+        previous = self._fingerprints
+        self._fingerprints = {
+            device_id: _fingerprint(device, self.fingerprint_ignored_keys)
+            for device_id, device in data.devices.items()
+        }
+        self.changed_devices = {
+            device_id
+            for device_id, fingerprint in self._fingerprints.items()
+            if previous.get(device_id) != fingerprint
+        }
+        # The devices of a location that failed or recovered are written, even
+        # though their payload is unchanged, so their availability follows it
+        for location_id in self._locations_toggled:
+            self.changed_devices |= self._location_devices[location_id].keys()
+        self.always_update = bool(self._locations_toggled)
+        if self.trace is not None:
+            self.trace.async_add(data.devices, self.changed_devices)
+        if (
+            self.data is not None
+            and not self.changed_devices
+            and self._fingerprints.keys() == previous.keys()
+            and data.locations == self.data.locations
+        ):
+            # Returning the same dataset keeps listeners from being called
+            self.counters["unchanged_refreshes"] += 1
+            return self.data
+
+        self.capture.add(data)
+        self.counters["unchanged_devices"] += len(data.devices) - len(
+            self.changed_devices
+        )
+        dataset = dataclasses.replace(
+            data,
+            devices={
+                device_id: self.normalizer.normalize_device(device)
+                if device_id in self.changed_devices
+                else self.data.devices[device_id]
+                for device_id, device in data.devices.items()
+            },
+        )
+        for device_id in self.changed_devices:
+            self.trends.async_add(device_id, dataset.devices[device_id], started)
+        return dataset
+
+    async def _async_fetch(self) -> KiddeDataset:
+        """Fetch the dataset covered by this coordinator.
+
+        The devices of each location are fetched concurrently. A location that
+        fails or times out keeps the devices from its last successful fetch,
+        which are unavailable until it recovers, so the refresh only fails when
+        every location does.
+        """
+        if self.location is None:
+            async with async_timeout.timeout(REFRESH_TIMEOUT):
+                locations = await async_get_locations(self.client)
+        else:
+            locations = {self.location["id"]: self.location}
+
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+
+        async def fetch_location(location_id: int) -> dict[int, dict]:
+            async with semaphore, async_timeout.timeout(REFRESH_TIMEOUT):
+                return await async_get_location_devices(self.client, location_id)
+
+        results = await asyncio.gather(
+            *(fetch_location(location_id) for location_id in locations),
+            return_exceptions=True,
+        )
+
+        devices: dict[int, dict] = {}
+        failures: dict[int, BaseException] = {}
+        location_devices = {}
+        for location_id, result in zip(locations, results, strict=True):
+            if isinstance(result, KiddeClientAuthError):
+                raise result
+            if isinstance(result, BaseException):
+                failures[location_id] = result
+                result = self._location_devices.get(location_id, {})
+            location_devices[location_id] = result
+            if duplicates := devices.keys() & result.keys():
+                self.counters["duplicate_devices"] += len(duplicates)
+                _LOGGER.warning(
+                    "Devices reported by more than one location, keeping those of location %s: %s",
+                    location_id,
+                    sorted(duplicates),
+                )
+            devices.update(result)
+        self._location_devices = location_devices
+        self._track_failures(locations, failures)
+
+        if failures:
+            if len(failures) == len(locations):
+                raise next(iter(failures.values()))
+            self.counters["partial_refreshes"] += 1
+
+        return KiddeDataset(locations, devices, None)
+
+    def _track_failures(
+        self, locations: dict[int, dict], failures: dict[int, BaseException]
+    ) -> None:
+        """Count the consecutive failures of each location, logging changes."""
+        self._locations_toggled = set()
+        for location_id in self.failed_locations.keys() - locations.keys():
+            del self.failed_locations[location_id]
+        for location_id in locations:
+            if (error := failures.get(location_id)) is not None:
+                if location_id not in self.failed_locations:
+                    self._locations_toggled.add(location_id)
+                    _LOGGER.warning(
+                        "Kidde location %s failed to refresh, its devices are unavailable until it recovers: %s: %s",
+                        location_id,
+                        type(error).__name__,
+                        error,
+                    )
+                self.failed_locations[location_id] = (
+                    self.failed_locations.get(location_id, 0) + 1
+                )
+            elif (failed := self.failed_locations.pop(location_id, None)) is not None:
+                self._locations_toggled.add(location_id)
+                _LOGGER.info(
+                    "Kidde location %s recovered after %s failed refreshes",
+                    location_id,
+                    failed,
+                )
+
+    @property
+    def alarm_active(self) -> bool:
+        """Return True if any device reported an alarm in the last refresh."""
+        if not self.data:
+            return False
+        return any(
+            device.get(key)
+            for device in self.data.devices.values()
+            for key in ALARM_KEYS
+        )
+
+    def _record_poll(self, started: float, start: float, success: bool) -> None:
+        """Record the timing of a refresh."""
+        self.poll_history.append((started, time.monotonic() - start, success))
@@ -0,0 +1,7 @@
+"""Entity descriptions shared by the Kidde HomeSafe platforms.
+
+There is one module per platform, so setting up a platform only imports its
+own Home Assistant entity component. The modules are only imported by the
+platform modules, so no entity component is loaded until the platforms are
+set up.
+"""
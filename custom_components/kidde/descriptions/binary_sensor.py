@@ -0,0 +1,92 @@
+"""Binary sensor entity descriptions for Kidde HomeSafe."""
+
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.const import EntityCategory
+
+BINARY_SENSOR_DESCRIPTIONS = (
+    BinarySensorEntityDescription(
+        key="smoke_alarm",
+        icon="mdi:smoke-detector-variant-alert",
+        name="Smoke Alarm",
+        device_class=BinarySensorDeviceClass.SMOKE,
+    ),
+    BinarySensorEntityDescription(
+        key="smoke_hushed",
+        icon="mdi:smoke-detector-variant-off",
+        name="Smoke Hushed",
+    ),
+    BinarySensorEntityDescription(
+        key="co_alarm",
+        icon="mdi:molecule-co",
+        name="CO Alarm",
+        device_class=BinarySensorDeviceClass.CO,
+    ),
+    BinarySensorEntityDescription(
+        key="hardwire_smoke",
+        icon="mdi:smoke-detector-variant-alert",
+        name="Hardwire Smoke Alarm",
+        device_class=BinarySensorDeviceClass.SMOKE,
+    ),
+    BinarySensorEntityDescription(
+        key="too_much_smoke",
+        icon="mdi:smoke-detector-variant-alert",
+        name="Too Much Smoke",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=BinarySensorDeviceClass.SMOKE,
+    ),
+    BinarySensorEntityDescription(
+        key="contact_lost",
+        icon="mdi:smoke-detector-variant-off",
+        name="Contact Lost",
+    ),
+    BinarySensorEntityDescription(
+        key="lost",
+        icon="mdi:smoke-detector-variant-off",
+        name="Lost",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    BinarySensorEntityDescription(
+        key="water_alarm",
+        icon="mdi:water-alert",
+        name="Water Alert",
+    ),
+    BinarySensorEntityDescription(
+        key="low_temp_alarm",
+        icon="mdi:snowflake-alert",
+        name="Freeze Alert",
+    ),
+    BinarySensorEntityDescription(
+        key="low_battery_alarm",
+        icon="mdi:battery-alert-variant",
+        name="Battery Low Alert",
+    ),
+    BinarySensorEntityDescription(
+        key="reset_flag",
+        icon="mdi:history",
+        name="Reset Flag",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+)
+
+INVERSE_BINARY_SENSOR_DESCRIPTIONS = (
+    BinarySensorEntityDescription(
+        key="offline",
+        icon="mdi:wifi-alert",
+        name="Online",
+        device_class=BinarySensorDeviceClass.CONNECTIVITY,
+    ),
+)
+
+BATTERY_SENSOR_DESCRIPTIONS = (
+    BinarySensorEntityDescription(
+        key="battery_state",
+        icon="mdi:battery",
+        name="Battery State",
+        device_class=BinarySensorDeviceClass.BATTERY,
+    ),
+)
@@ -0,0 +1,38 @@
+"""Button entity descriptions for Kidde HomeSafe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.components.button import ButtonEntityDescription
+from kidde_homesafe import KiddeCommand
+
+
+@dataclass
+class KiddeButtonEntityDescriptionMixin:
+    """Mixin for required keys."""
+
+    kidde_command: KiddeCommand
+
+
+@dataclass
+class KiddeButtonEntityDescription(
+    ButtonEntityDescription, KiddeButtonEntityDescriptionMixin
+):
+    """Describes Kidde Button entity."""
+
+
+BUTTON_DESCRIPTIONS = (
+    KiddeButtonEntityDescription(
+        key="test",
+        icon="mdi:smoke-detector-variant-alert",
+        name="Test",
+        kidde_command=KiddeCommand.TEST,
+    ),
+    KiddeButtonEntityDescription(
+        key="hush",
+        icon="mdi:smoke-detector-variant-off",
+        name="Hush",
+        kidde_command=KiddeCommand.HUSH,
+    ),
+)
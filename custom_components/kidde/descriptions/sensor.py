@@ -0,0 +1,306 @@
+"""Sensor entity descriptions for Kidde HomeSafe.
+
+The compact diagnostics sensor carries the values of the binary sensors too,
+so this imports their descriptions. Every device has safety-critical binary
+sensors, so the binary sensor platform is set up along with this one anyway.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS,
+    EntityCategory,
+    UnitOfElectricPotential,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+from ..const import SAFETY_KEYS, TO_REDACT
+from .binary_sensor import (
+    BATTERY_SENSOR_DESCRIPTIONS,
+    BINARY_SENSOR_DESCRIPTIONS,
+    INVERSE_BINARY_SENSOR_DESCRIPTIONS,
+)
+
+TIMESTAMP_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="last_seen",
+        icon="mdi:home-clock",
+        name="Last Seen",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    SensorEntityDescription(
+        key="last_test_time",
+        icon="mdi:home-clock",
+        name="Last Test Time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    SensorEntityDescription(
+        key="iaq_last_test_time",
+        icon="mdi:home-clock",
+        name="IAQ Last Test Time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+)
+
+SENSOR_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="overall_iaq_status",
+        icon="mdi:air-filter",
+        name="Overall Air Quality",
+        device_class=SensorDeviceClass.ENUM,
+        options=["Very Bad", "Bad", "Moderate", "Good"],
+    ),
+    SensorEntityDescription(
+        key="smoke_level",
+        icon="mdi:smoke",
+        name="Smoke Level",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="co_level",
+        icon="mdi:molecule-co",
+        name="CO Level",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="batt_volt",
+        icon="mdi:battery",
+        name="Battery Voltage",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="life",
+        icon="mdi:calendar-clock",
+        name="Weeks to replace",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.WEEKS,
+    ),
+    SensorEntityDescription(
+        key="ap_rssi",
+        icon="mdi:wifi-strength-3",
+        name="Signal strength",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="ssid",
+        icon="mdi:wifi",
+        name="SSID",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="alarm_interval",
+        icon="mdi:alarm-check",
+        name="Alarm Interval",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="alarm_reset_time",
+        icon="mdi:alarm-snooze",
+        name="Alarm Reset Time",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="battery_level",
+        icon="mdi:battery-high",
+        name="Battery Level",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="battery_voltage",
+        icon="mdi:battery",
+        name="Battery Voltage",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.VOLTAGE,
+    ),
+    SensorEntityDescription(
+        key="checkin_interval",
+        icon="mdi:clock-check",
+        name="Checkin Interval",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+    ),
+    SensorEntityDescription(
+        key="hold_alarm_time",
+        icon="mdi:alarm-plus",
+        name="Alarm Hold Time",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="rapid_temperature_variation_status",
+        icon="mdi:swap-vertical-variant",
+        name="Temperature Variation Status",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="temperature_variation_value",
+        icon="mdi:swap-vertical-variant",
+        name="Temperature Variation",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="temperature",
+        name="Temperature",
+        icon="mdi:home-thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
+    ),
+)
+
+SENSOR_MEASUREMENT_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="iaq_temperature",
+        name="Indoor Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="humidity",
+        name="Humidity",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="hpa",
+        name="Air Pressure",
+        device_class=SensorDeviceClass.ATMOSPHERIC_PRESSURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="tvoc",
+        name="Total VOC",
+        device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="iaq",
+        name="Indoor Air Quality",
+        device_class=SensorDeviceClass.AQI,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="co2",
+        name="CO₂ Level",
+        device_class=SensorDeviceClass.CO2,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
+@dataclass
+class KiddePredictionSensorEntityDescriptionMixin:
+    """Mixin for required keys."""
+
+    trend_keys: tuple[str, ...]
+
+
+@dataclass
+class KiddePredictionSensorEntityDescription(
+    SensorEntityDescription, KiddePredictionSensorEntityDescriptionMixin
+):
+    """Describes Kidde sensor predicting when a trend reaches its end."""
+
+
+PREDICTION_DESCRIPTIONS = (
+    KiddePredictionSensorEntityDescription(
+        key="battery_depletion",
+        icon="mdi:battery-clock",
+        name="Predicted Battery Depletion",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        trend_keys=("batt_volt", "battery_voltage"),
+    ),
+    KiddePredictionSensorEntityDescription(
+        key="end_of_life",
+        icon="mdi:calendar-clock",
+        name="End of Life",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        trend_keys=("life",),
+    ),
+)
+
+RATE_BUDGET_DESCRIPTION = SensorEntityDescription(
+    key="api_budget",
+    icon="mdi:speedometer",
+    name="API Budget",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+
+ALARM_LATENCY_DESCRIPTION = SensorEntityDescription(
+    key="alarm_latency",
+    icon="mdi:timer-alert-outline",
+    name="Alarm Latency",
+    device_class=SensorDeviceClass.DURATION,
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+
+# Compact mode replaces the non safety-critical entities of a device with this
+# sensor, which carries their values as attributes
+DIAGNOSTICS_DESCRIPTION = SensorEntityDescription(
+    key="diagnostics",
+    icon="mdi:information-outline",
+    name="Diagnostics",
+    device_class=SensorDeviceClass.TIMESTAMP,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+DIAGNOSTICS_ATTRIBUTE_KEYS = tuple(
+    entity_description.key
+    for entity_description in (
+        *TIMESTAMP_DESCRIPTIONS,
+        *SENSOR_DESCRIPTIONS,
+        *SENSOR_MEASUREMENT_DESCRIPTIONS,
+        *BINARY_SENSOR_DESCRIPTIONS,
+        *INVERSE_BINARY_SENSOR_DESCRIPTIONS,
+        *BATTERY_SENSOR_DESCRIPTIONS,
+    )
+    # Redacted values such as the SSID are private, and the diagnostics sensor
+    # is enabled by default
+    if entity_description.key not in SAFETY_KEYS
+    and entity_description.key not in TO_REDACT
+)
+
+# Frequently changing attributes of the diagnostics sensor, left out of the
+# recorder so a change does not record another copy of every attribute
+DIAGNOSTICS_UNRECORDED_KEYS = frozenset(
+    {
+        "ap_rssi",
+        "batt_volt",
+        "battery_level",
+        "battery_voltage",
+        "co_level",
+        "smoke_level",
+        "temperature",
+        "temperature_variation_value",
+        *(
+            f"{entity_description.key}{suffix}"
+            for entity_description in SENSOR_MEASUREMENT_DESCRIPTIONS
+            for suffix in ("", "_status")
+        ),
+    }
+)
@@ -0,0 +1,34 @@
+"""Switch entity descriptions for Kidde HomeSafe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.components.switch import SwitchEntityDescription
+from kidde_homesafe import KiddeCommand
+
+
+@dataclass
+class KiddeSwitchEntityDescriptionMixin:
+    """Mixin for required keys."""
+
+    kidde_command_on: KiddeCommand
+    kidde_command_off: KiddeCommand
+
+
+@dataclass
+class KiddeSwitchEntityDescription(
+    SwitchEntityDescription, KiddeSwitchEntityDescriptionMixin
+):
+    """Describes Kidde Switch entity."""
+
+
+SWITCH_DESCRIPTIONS = (
+    KiddeSwitchEntityDescription(
+        key="identifying",
+        name="Identifying",
+        icon="mdi:home-sound-out",
+        kidde_command_on=KiddeCommand.IDENTIFY,
+        kidde_command_off=KiddeCommand.IDENTIFYCANCEL,
+    ),
+)
@@ -0,0 +1,65 @@
+"""Diagnostics support for Kidde HomeSafe."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .account import KiddeAccount
+from .const import DOMAIN, TO_REDACT
+from .coordinator import KiddeCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    account: KiddeAccount = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        # The entry title contains the account email, so only data and options
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "platforms": sorted(account.platforms),
+        "compact": account.compact,
+        "entity_count": account.entity_count,
+        "rate_budget": {
+            "tokens": round(account.budget.tokens, 1),
+            "waiting": account.budget.waiting,
+            "counters": dict(account.budget.counters),
+        },
+        "alarm_latency": account.alarm_latency.as_dict(),
+        "coordinators": {
+            str(location_id or "account"): _coordinator_diagnostics(coordinator)
+            for location_id, coordinator in account.coordinators.items()
+        },
+    }
+
+
+def _coordinator_diagnostics(coordinator: KiddeCoordinator) -> dict[str, Any]:
+    """Return diagnostics for a coordinator."""
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "counters": dict(coordinator.counters),
+        "failed_locations": {
+            str(location_id): failures
+            for location_id, failures in coordinator.failed_locations.items()
+        },
+        "poll_history": [
+            {
+                "started": dt_util.utc_from_timestamp(started).isoformat(),
+                "duration": round(duration, 3),
+                "success": success,
+            }
+            for started, duration, success in coordinator.poll_history
+        ],
+        "schema_drift": coordinator.normalizer.drift,
+        "capture_bytes": coordinator.capture.size,
+        "payloads": async_redact_data(coordinator.capture.as_list(), TO_REDACT),
+    }
@@ -4,15 +4,20 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from kidde_homesafe import KiddeCommand
 
-from .const import DOMAIN, MANUFACTURER
+from .const import ACCOUNT_DEVICE_NAME, DOMAIN, MANUFACTURER
 from .coordinator import KiddeCoordinator
+from .ratelimit import KiddePriority
 
 # Constants for dictionary keys
 KEY_MODEL = "model"
+KEY_LOCATION_ID = "location_id"
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,29 @@ class KiddeEntity(CoordinatorEntity[KiddeCoordinator]):
         self.device_id = device_id
         self.entity_description = entity_description
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
+
+        State is only written when this device's payload changed, or when the
+        availability of the coordinator changed.
+        """
+        if (
+            self.coordinator.last_update_success
+            and self.device_id not in self.coordinator.changed_devices
+        ):
+            return
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return False while the device's location is failing to refresh."""
+        return (
+            super().available
+            and self.kidde_device.get(KEY_LOCATION_ID)
+            not in self.coordinator.failed_locations
+        )
+
     @property
     def kidde_device(self) -> dict:
         """The device from the coordinator's data."""
@@ -81,4 +109,25 @@ class KiddeEntity(CoordinatorEntity[KiddeCoordinator]):
         """Send a Kidde command for this device."""
         client = self.coordinator.client
         device = self.kidde_device
+        await self.coordinator.budget.acquire(KiddePriority.URGENT)
         await client.device_command(device["location_id"], device["id"], command)
+
+
+class KiddeAccountEntity(Entity):
+    """Entity base class for the Kidde account rather than a device."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self, entry: ConfigEntry, entity_description: EntityDescription
+    ) -> None:
+        """Initialize."""
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{entry.entry_id}_{entity_description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=ACCOUNT_DEVICE_NAME,
+            manufacturer=MANUFACTURER,
+            entry_type=DeviceEntryType.SERVICE,
+        )
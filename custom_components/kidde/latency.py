@@ -0,0 +1,130 @@
+"""Streaming measurement of Kidde HomeSafe alarm latency."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import LATENCY_MAX_BUCKETS, LATENCY_RELATIVE_ACCURACY
+
+# Latencies at or below this many seconds, including negative ones caused by
+# clock skew, are counted as zero
+MIN_LATENCY = 0.01
+
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+
+class KiddeLatencySketch:
+    """Streaming sketch of a latency distribution.
+
+    Values are counted in logarithmically sized buckets, so every quantile is
+    within the relative accuracy of the true value, no samples are stored and
+    memory is bounded by the number of buckets. Past that bound, the lowest
+    buckets are merged, which only costs accuracy for the lowest quantiles.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = LATENCY_RELATIVE_ACCURACY,
+        max_buckets: int = LATENCY_MAX_BUCKETS,
+    ) -> None:
+        """Initialize an empty sketch."""
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._buckets: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a latency in seconds."""
+        value = max(value, 0.0)
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= MIN_LATENCY:
+            self._zero += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        if len(self._buckets) > self._max_buckets:
+            lowest, second = sorted(self._buckets)[:2]
+            self._buckets[second] += self._buckets.pop(lowest)
+
+    def quantile(self, quantile: float) -> float | None:
+        """Return the estimated latency at a quantile between 0 and 1."""
+        if not self.count:
+            return None
+        rank = quantile * (self.count - 1)
+        seen = self._zero
+        if rank < seen:
+            return self.min
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                estimate = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the count, mean, extremes and quantiles of the distribution."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1),
+            "min": round(self.min, 1),
+            "max": round(self.max, 1),
+            **{
+                name: round(self.quantile(quantile), 1)
+                for name, quantile in QUANTILES.items()
+            },
+        }
+
+
+class KiddeAlarmLatency:
+    """Latency from a device reporting an alarm to its binary sensor being written.
+
+    Kept for the whole account and per device and alarm key.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the measurement."""
+        self.overall = KiddeLatencySketch()
+        self.by_alarm: dict[tuple[int, str], KiddeLatencySketch] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_record(self, device_id: int, key: str, latency: float) -> None:
+        """Record the latency of an alarm."""
+        self.overall.add(latency)
+        if (sketch := self.by_alarm.get((device_id, key))) is None:
+            sketch = self.by_alarm[device_id, key] = KiddeLatencySketch()
+        sketch.add(latency)
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for recorded latencies."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the distributions for the account and every alarm."""
+        by_device: dict[str, dict[str, Any]] = {}
+        for (device_id, key), sketch in self.by_alarm.items():
+            by_device.setdefault(str(device_id), {})[key] = sketch.as_dict()
+        return {"overall": self.overall.as_dict(), "by_device": by_device}
@@ -0,0 +1,163 @@
+"""Validation and normalization of Kidde HomeSafe API payloads."""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from typing import Any, NamedTuple
+
+from homeassistant.const import (
+    CONCENTRATION_PARTS_PER_BILLION,
+    CONCENTRATION_PARTS_PER_MILLION,
+    PERCENTAGE,
+    UnitOfElectricPotential,
+    UnitOfPressure,
+    UnitOfTemperature,
+)
+from kidde_homesafe import KiddeDataset
+
+# Constants for dictionary keys
+KEY_LABEL = "label"
+KEY_VALUE = "value"
+KEY_STATUS = "status"
+KEY_UNIT = "Unit"
+
+# Keys reported as a datetime string, e.g. '2024-06-14T03:40:39.667544824Z'
+TIMESTAMP_KEYS = ("last_seen", "last_test_time", "iaq_last_test_time")
+
+# Keys reported as a dictionary with a value, a status and a unit, e.g.
+# "tvoc": {"value": 605.09, "status": "Moderate", "Unit": "ppb"}
+MEASUREMENT_KEYS = ("iaq_temperature", "humidity", "hpa", "tvoc", "iaq", "co2")
+
+# Keys reported as a plain number
+NUMERIC_KEYS = (
+    "smoke_level",
+    "co_level",
+    "batt_volt",
+    "life",
+    "ap_rssi",
+    "battery_voltage",
+    "checkin_interval",
+    "temperature",
+)
+
+UNITS = {
+    "C": UnitOfTemperature.CELSIUS,
+    "F": UnitOfTemperature.FAHRENHEIT,
+    "%RH": PERCENTAGE,
+    "HPA": UnitOfPressure.HPA,
+    "PPB": CONCENTRATION_PARTS_PER_BILLION,
+    "PPM": CONCENTRATION_PARTS_PER_MILLION,
+    "V": UnitOfElectricPotential.VOLT,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class KiddeMeasurement(NamedTuple):
+    """A normalized measurement reading."""
+
+    value: float | None
+    unit: str | None
+    status: str | None
+
+
+class KiddePayloadError(ValueError):
+    """Exception to indicate a payload that cannot be used."""
+
+
+class KiddeNormalizer:
+    """Validate and normalize the datasets returned by the Kidde API.
+
+    The coordinator validates every refresh and normalizes the devices whose
+    payload changed, so entities can read values without any checks. Schema drift,
+    such as an unexpected type or an unknown unit, is logged once per key.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the normalizer."""
+        self.drift: dict[str, str] = {}
+
+    def validate(self, dataset: KiddeDataset) -> None:
+        """Raise KiddePayloadError if the dataset is malformed."""
+        if not isinstance(dataset.locations, dict):
+            raise KiddePayloadError("Locations are missing from the payload")
+        if not isinstance(dataset.devices, dict):
+            raise KiddePayloadError("Devices are missing from the payload")
+
+        for device_id, device in dataset.devices.items():
+            if not isinstance(device, dict) or KEY_LABEL not in device:
+                raise KiddePayloadError(f"Malformed device [{device_id}]")
+
+    def normalize_device(self, device: dict[str, Any]) -> dict[str, Any]:
+        """Return a normalized copy of a device."""
+        normalized = dict(device)
+        for key in TIMESTAMP_KEYS:
+            if key in device:
+                normalized[key] = self._timestamp(key, device[key])
+        for key in MEASUREMENT_KEYS:
+            if key in device:
+                normalized[key] = self._measurement(key, device[key])
+        for key in NUMERIC_KEYS:
+            if key in device:
+                normalized[key] = self._number(key, device[key])
+        return normalized
+
+    def _timestamp(self, key: str, value: Any) -> dt.datetime | None:
+        """Parse a datetime string."""
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            self._report(key, f"expected a datetime string, got {type(value)}")
+            return None
+        # Last seen and last test return different precision for time, so we
+        # need to strip anything beyond microseconds
+        # https://github.com/tache/homeassistant-kidde/issues/7
+        stripped = value.strip("Z").split(".")[0]
+        try:
+            return dt.datetime.strptime(stripped, "%Y-%m-%dT%H:%M:%S").replace(
+                tzinfo=dt.UTC
+            )
+        except ValueError as e:
+            self._report(key, f"cannot parse datetime '{value}': {e}")
+            return None
+
+    def _measurement(self, key: str, value: Any) -> KiddeMeasurement | None:
+        """Normalize a measurement dictionary."""
+        if not isinstance(value, dict):
+            self._report(key, f"expected a measurement dict, got {type(value)}")
+            return None
+
+        raw_unit = value.get(KEY_UNIT)
+        unit = UNITS.get(raw_unit.upper()) if isinstance(raw_unit, str) else None
+        if unit is None:
+            self._report(key, f"unknown unit [{raw_unit}]")
+
+        return KiddeMeasurement(
+            self._number(key, value.get(KEY_VALUE)), unit, value.get(KEY_STATUS)
+        )
+
+    def _number(self, key: str, value: Any) -> float | int | None:
+        """Coerce a number, which may have been reported as a string."""
+        if value is None or (
+            isinstance(value, int | float) and not isinstance(value, bool)
+        ):
+            return value
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        self._report(key, f"expected a number, got {type(value)} '{value}'")
+        return None
+
+    def _report(self, key: str, problem: str) -> None:
+        """Log schema drift the first time it is seen for a key."""
+        if key in self.drift:
+            return
+        self.drift[key] = problem
+        logger.warning(
+            "Unexpected Kidde payload for [%s]: %s ... Please send Kidde device data to maintainers.",
+            key,
+            problem,
+        )
@@ -0,0 +1,70 @@
+"""On-demand profiling of Kidde HomeSafe coordinator refreshes."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import pstats
+from collections.abc import Callable
+from pathlib import Path
+
+from homeassistant.core import callback
+
+logger = logging.getLogger(__name__)
+
+
+class KiddeProfiler:
+    """Profile a number of refreshes and the entity state writes they trigger.
+
+    Coordinators only check whether a profiler is attached, so there is no cost
+    while none is. Refreshes of sharded coordinators may overlap, so the profile
+    is enabled while any profiled refresh is running. Other tasks that run while
+    a refresh waits on the API are included in the report.
+    """
+
+    def __init__(
+        self, path: Path, refreshes: int, on_finished: Callable[[], None]
+    ) -> None:
+        """Initialize the profiler."""
+        self.path = path
+        self.remaining = refreshes
+        self.profiled = 0
+        self._on_finished = on_finished
+        self._profile = cProfile.Profile()
+        self._running = 0
+
+    @callback
+    def async_start(self) -> bool:
+        """Start profiling a refresh, returning False if it is not profiled."""
+        if self.remaining <= 0:
+            return False
+        if not self._running:
+            try:
+                self._profile.enable()
+            except ValueError as e:
+                # Another profiler, such as Home Assistant's, is already active
+                logger.warning("Cannot profile Kidde refreshes: %s", e)
+                self.remaining = 0
+                self._on_finished()
+                return False
+        self.remaining -= 1
+        self._running += 1
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop profiling a refresh, finishing after the last one."""
+        self._running -= 1
+        self.profiled += 1
+        if self._running:
+            return
+        self._profile.disable()
+        if self.remaining <= 0:
+            self._on_finished()
+
+    def write_report(self) -> None:
+        """Write the profile sorted by cumulative time."""
+        with self.path.open("w", encoding="utf-8") as report:
+            report.write(f"Kidde HomeSafe profile of {self.profiled} refreshes\n\n")
+            stats = pstats.Stats(self._profile, stream=report)
+            stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
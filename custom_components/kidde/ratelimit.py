@@ -0,0 +1,151 @@
+"""Rate budget shared by every request made to the Kidde cloud for an account."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from collections.abc import Callable
+from enum import IntEnum
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+
+class KiddePriority(IntEnum):
+    """Priority classes for API requests, most urgent first."""
+
+    URGENT = 0  # Device commands and polls following up on an alarm
+    POLL = 1  # Routine coordinator polls
+    BACKGROUND = 2  # Diagnostics and other non-essential requests
+
+
+class KiddeRateBudget:
+    """Token bucket limiting the request rate of an account.
+
+    Requests that cannot be served immediately are deferred, never dropped, and
+    are granted in priority order as the bucket refills.
+    """
+
+    def __init__(self, hass: HomeAssistant, capacity: int, per_minute: float) -> None:
+        """Initialize the budget with a full bucket."""
+        self._hass = hass
+        self.capacity = capacity
+        self.per_minute = per_minute
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Heap of (priority, sequence, cost, future) for deferred requests
+        self._waiters: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        self.counters: Counter[str] = Counter()
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of requests that can be made right now."""
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> dict[str, int]:
+        """Return the number of deferred requests per priority."""
+        waiting = Counter(
+            KiddePriority(priority).name.lower()
+            for priority, _, _, future in self._waiters
+            if not future.done()
+        )
+        return dict(waiting)
+
+    async def acquire(self, priority: KiddePriority, cost: int = 1) -> None:
+        """Wait until the budget allows a request costing `cost` tokens."""
+        cost = min(cost, self.capacity)
+        name = priority.name.lower()
+        self._refill()
+        if not self._waiters and self._tokens >= cost:
+            self._tokens -= cost
+            self.counters[f"granted_{name}"] += 1
+            self._async_notify()
+            return
+
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), cost, future))
+        self.counters[f"deferred_{name}"] += 1
+        if self._timer and self._waiters[0][3] is future:
+            # Served before the requests already waiting, so the grant is due
+            # when there are enough tokens for this request instead
+            self._timer.cancel()
+            self._timer = None
+        self._async_schedule()
+        self._async_notify()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the caller gave up, so hand the tokens back
+                self._tokens = min(self._tokens + cost, self.capacity)
+            raise
+        self.counters[f"granted_{name}"] += 1
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for changes to the budget."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the refill timer and every deferred request."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        for _, _, _, future in self._waiters:
+            future.cancel()
+        self._waiters.clear()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.per_minute / 60
+        )
+        self._updated = now
+
+    @callback
+    def _async_grant(self) -> None:
+        """Grant deferred requests in priority order while tokens last."""
+        self._timer = None
+        self._refill()
+        while self._waiters:
+            _, _, cost, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < cost:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= cost
+            future.set_result(None)
+        self._async_schedule()
+        self._async_notify()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Schedule a grant for when the first deferred request can be served."""
+        if self._timer or not self._waiters:
+            return
+        cost = self._waiters[0][2]
+        delay = max(0.0, (cost - self._tokens) * 60 / self.per_minute)
+        self._timer = self._hass.loop.call_later(delay, self._async_grant)
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify listeners of a change to the budget."""
+        for update_callback in list(self._listeners):
+            update_callback()
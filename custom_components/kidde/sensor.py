@@ -6,35 +6,38 @@ import datetime
 import logging
 
 from homeassistant.components.sensor import (
-    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    CONCENTRATION_PARTS_PER_BILLION,
-    CONCENTRATION_PARTS_PER_MILLION,
-    PERCENTAGE,
-    SIGNAL_STRENGTH_DECIBELS,
-    EntityCategory,
-    UnitOfElectricPotential,
-    UnitOfPressure,
-    UnitOfTemperature,
-    UnitOfTime,
-)
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .account import KiddeAccount
+from .const import DOMAIN, RATE_BUDGET_SENSOR_COOLDOWN
 from .coordinator import KiddeCoordinator
-from .entity import KiddeEntity
+from .descriptions.sensor import (
+    ALARM_LATENCY_DESCRIPTION,
+    DIAGNOSTICS_ATTRIBUTE_KEYS,
+    DIAGNOSTICS_DESCRIPTION,
+    DIAGNOSTICS_UNRECORDED_KEYS,
+    PREDICTION_DESCRIPTIONS,
+    RATE_BUDGET_DESCRIPTION,
+    SENSOR_DESCRIPTIONS,
+    SENSOR_MEASUREMENT_DESCRIPTIONS,
+    TIMESTAMP_DESCRIPTIONS,
+    KiddePredictionSensorEntityDescription,
+)
+from .entity import KiddeAccountEntity, KiddeEntity
+from .latency import KiddeAlarmLatency
+from .normalize import KiddeMeasurement
+from .ratelimit import KiddeRateBudget
 
 # Constants for dictionary keys
 KEY_MODEL = "model"
-KEY_VALUE = "value"
-KEY_STATUS = "status"
-KEY_UNIT = "Unit"
+KEY_LAST_SEEN = "last_seen"
 KEY_CAPABILITIES = "capabilities"
 KEY_IAQ = "iaq"
 KEY_TEMPERATURE = "temperature"
@@ -42,287 +45,94 @@ KEY_TEMPERATURE = "temperature"
 logger = logging.getLogger(__name__)
 
 
-_TIMESTAMP_DESCRIPTIONS = (
-    SensorEntityDescription(
-        key="last_seen",
-        icon="mdi:home-clock",
-        name="Last Seen",
-        device_class=SensorDeviceClass.TIMESTAMP,
-    ),
-    SensorEntityDescription(
-        key="last_test_time",
-        icon="mdi:home-clock",
-        name="Last Test Time",
-        device_class=SensorDeviceClass.TIMESTAMP,
-    ),
-    SensorEntityDescription(
-        key="iaq_last_test_time",
-        icon="mdi:home-clock",
-        name="IAQ Last Test Time",
-        device_class=SensorDeviceClass.TIMESTAMP,
-    ),
-)
-
-_SENSOR_DESCRIPTIONS = (
-    SensorEntityDescription(
-        key="overall_iaq_status",
-        icon="mdi:air-filter",
-        name="Overall Air Quality",
-        device_class=SensorDeviceClass.ENUM,
-        options=["Very Bad", "Bad", "Moderate", "Good"],
-    ),
-    SensorEntityDescription(
-        key="smoke_level",
-        icon="mdi:smoke",
-        name="Smoke Level",
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="co_level",
-        icon="mdi:molecule-co",
-        name="CO Level",
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="batt_volt",
-        icon="mdi:battery",
-        name="Battery Voltage",
-        state_class=SensorStateClass.MEASUREMENT,
-        device_class=SensorDeviceClass.VOLTAGE,
-        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
-        suggested_display_precision=2,
-    ),
-    SensorEntityDescription(
-        key="life",
-        icon="mdi:calendar-clock",
-        name="Weeks to replace",
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTime.WEEKS,
-    ),
-    SensorEntityDescription(
-        key="ap_rssi",
-        icon="mdi:wifi-strength-3",
-        name="Signal strength",
-        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
-        state_class=SensorStateClass.MEASUREMENT,
-        entity_category=EntityCategory.DIAGNOSTIC,
-        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
-        entity_registry_enabled_default=False,
-    ),
-    SensorEntityDescription(
-        key="ssid",
-        icon="mdi:wifi",
-        name="SSID",
-        entity_category=EntityCategory.DIAGNOSTIC,
-        entity_registry_enabled_default=False,
-    ),
-    SensorEntityDescription(
-        key="alarm_interval",
-        icon="mdi:alarm-check",
-        name="Alarm Interval",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    SensorEntityDescription(
-        key="alarm_reset_time",
-        icon="mdi:alarm-snooze",
-        name="Alarm Reset Time",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    SensorEntityDescription(
-        key="battery_level",
-        icon="mdi:battery-high",
-        name="Battery Level",
-        entity_category=EntityCategory.DIAGNOSTIC,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="battery_voltage",
-        icon="mdi:battery",
-        name="Battery Voltage",
-        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
-        suggested_display_precision=2,
-        entity_category=EntityCategory.DIAGNOSTIC,
-        state_class=SensorStateClass.MEASUREMENT,
-        device_class=SensorDeviceClass.VOLTAGE,
-    ),
-    SensorEntityDescription(
-        key="checkin_interval",
-        icon="mdi:clock-check",
-        name="Checkin Interval",
-        entity_category=EntityCategory.DIAGNOSTIC,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTime.HOURS,
-    ),
-    SensorEntityDescription(
-        key="hold_alarm_time",
-        icon="mdi:alarm-plus",
-        name="Alarm Hold Time",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    SensorEntityDescription(
-        key="rapid_temperature_variation_status",
-        icon="mdi:swap-vertical-variant",
-        name="Temperature Variation Status",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    SensorEntityDescription(
-        key="temperature_variation_value",
-        icon="mdi:swap-vertical-variant",
-        name="Temperature Variation",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-    SensorEntityDescription(
-        key="temperature",
-        name="Temperature",
-        icon="mdi:home-thermometer",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
-    ),
-)
-
-_SENSOR_MEASUREMENT_DESCRIPTIONS = (
-    SensorEntityDescription(
-        key="iaq_temperature",
-        name="Indoor Temperature",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="humidity",
-        name="Humidity",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="hpa",
-        name="Air Pressure",
-        device_class=SensorDeviceClass.ATMOSPHERIC_PRESSURE,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="tvoc",
-        name="Total VOC",
-        device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="iaq",
-        name="Indoor Air Quality",
-        device_class=SensorDeviceClass.AQI,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="co2",
-        name="CO₂ Level",
-        device_class=SensorDeviceClass.CO2,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-)
-
-
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
 ) -> None:
     """Set up the sensor platform."""
-    coordinator: KiddeCoordinator = hass.data[DOMAIN][entry.entry_id]
+    account: KiddeAccount = hass.data[DOMAIN][entry.entry_id]
+    async_add_devices(
+        [
+            KiddeRateBudgetSensorEntity(entry, account.budget, RATE_BUDGET_DESCRIPTION),
+            KiddeAlarmLatencySensorEntity(
+                entry, account.alarm_latency, ALARM_LATENCY_DESCRIPTION
+            ),
+        ]
+    )
+    account.async_add_device_entities(
+        async_add_devices,
+        _device_compact_sensors if account.compact else _device_sensors,
+    )
+
+
+def _device_sensors(
+    coordinator: KiddeCoordinator, device_id: int, device_data: dict
+) -> list[SensorEntity]:
+    """Create the sensors of a device."""
     sensors: list[SensorEntity] = []
 
-    for device_id, device_data in coordinator.data.devices.items():
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(
-                "Checking model: [%s]",
-                coordinator.data.devices[device_id].get(KEY_MODEL, "Unknown"),
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checking model: [%s]", device_data.get(KEY_MODEL, "Unknown"))
+
+    for entity_description in TIMESTAMP_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            sensors.append(
+                KiddeSensorTimestampEntity(coordinator, device_id, entity_description)
             )
 
-        for entity_description in _TIMESTAMP_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                sensors.append(
-                    KiddeSensorTimestampEntity(
-                        coordinator, device_id, entity_description
-                    )
-                )
+    for entity_description in SENSOR_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            sensors.append(KiddeSensorEntity(coordinator, device_id, entity_description))
 
-        for entity_description in _SENSOR_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                sensors.append(
-                    KiddeSensorEntity(coordinator, device_id, entity_description)
-                )
+    for entity_description in SENSOR_MEASUREMENT_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            sensors.append(
+                KiddeSensorMeasurementEntity(coordinator, device_id, entity_description)
+            )
 
-        for entity_description in _SENSOR_MEASUREMENT_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                sensors.append(
-                    KiddeSensorMeasurementEntity(
-                        coordinator, device_id, entity_description
-                    )
-                )
+    for entity_description in PREDICTION_DESCRIPTIONS:
+        if any(key in device_data for key in entity_description.trend_keys):
+            sensors.append(
+                KiddePredictionSensorEntity(coordinator, device_id, entity_description)
+            )
+
+    return sensors
 
-    # NOTE: It is possible that sensors is an empty list. Is that OK?
 
-    async_add_devices(sensors)
+def _device_compact_sensors(
+    coordinator: KiddeCoordinator, device_id: int, device_data: dict
+) -> list[SensorEntity]:
+    """Create the consolidated diagnostics sensor of a device for compact mode."""
+    return [
+        KiddeDiagnosticsSensorEntity(coordinator, device_id, DIAGNOSTICS_DESCRIPTION)
+    ]
 
 
 class KiddeSensorTimestampEntity(KiddeEntity, SensorEntity):
     """A KiddeSensoryEntity which returns a datetime.
 
-    Assume sensor returns datetime string e.g. '2024-06-14T03:40:39.667544824Z'
-    or '2024-06-22T16:00:19Z' which needs to be converted to a python datetime.
+    The coordinator has already parsed the datetime string reported by the API.
     """
 
     @property
     def native_value(self) -> datetime.datetime | None:
         """Return the native value of the sensor."""
-        value = self.kidde_device.get(self.entity_description.key)
-        dtype = type(value)
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(
-                "%s, of type %s is %s",
-                self.entity_description.key,
-                dtype,
-                value,
-            )
-        if value is None:
-            return value
-        # Last seen and last test return different precision for time, so we
-        # need to strip anything beyond microseconds
-        # https://github.com/tache/homeassistant-kidde/issues/7
-        stripped = value.strip("Z").split(".")[0]
-        try:
-            return datetime.datetime.strptime(stripped, "%Y-%m-%dT%H:%M:%S").replace(
-                tzinfo=datetime.UTC
-            )
-        except ValueError as e:
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.error("Error parsing datetime '%s': %s", value, e)
-            return None
+        return self.kidde_device.get(self.entity_description.key)
 
 
 class KiddeSensorEntity(KiddeEntity, SensorEntity):
     """Sensor for Kidde HomeSafe."""
 
     @property
-    def native_value(self) -> str | None | float | int:
+    def native_value(self) -> str | float | int | None:
         """Return the native value of the sensor."""
-        value = self.kidde_device.get(self.entity_description.key)
-        dtype = type(value)
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(
-                "%s, of type %s is %s",
-                self.entity_description.key,
-                dtype,
-                value,
-            )
-        return value
+        return self.kidde_device.get(self.entity_description.key)
 
 
 class KiddeSensorMeasurementEntity(KiddeEntity, SensorEntity):
     """Measurement Sensor for Kidde HomeSafe.
 
-    We expect the Kidde API to report sensor output as a dictionary containing
-    a float or intenger value, a string qualitative status string, and a units
-    string. For example: "tvoc": { "value": 605.09, "status": "Moderate",
-    "Unit": "ppb"}.
-
+    The coordinator normalizes the measurement dictionary reported by the API
+    into a KiddeMeasurement, or None when it could not be used.
     """
 
     @property
@@ -330,77 +140,159 @@ class KiddeSensorMeasurementEntity(KiddeEntity, SensorEntity):
         """Return the state class of sensor."""
         return SensorStateClass.MEASUREMENT
 
+    @property
+    def measurement(self) -> KiddeMeasurement | None:
+        """The normalized measurement from the coordinator's data."""
+        return self.kidde_device.get(self.entity_description.key)
+
     @property
     def native_value(self) -> float | None:
         """Return the native value of the sensor."""
-        entity_dict = self.kidde_device.get(self.entity_description.key)
-        if isinstance(entity_dict, dict):
-            sensor_value = entity_dict.get(KEY_VALUE)
-        else:
-            ktype = type(entity_dict)
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.warning(
-                    "Unexpected type [%s], expected entity dict for [%s]",
-                    ktype,
-                    self.entity_description.key,
-                )
-            sensor_value = None
-        return sensor_value
+        measurement = self.measurement
+        return measurement.value if measurement else None
 
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the native unit of measurement of the sensor."""
-        entity_dict = self.kidde_device.get(self.entity_description.key)
-
-        if not isinstance(entity_dict, dict):
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.warning(
-                    "Unexpected type [%s], expected entity dict for [%s]",
-                    type(entity_dict),
-                    self.entity_description.key,
-                )
-            return None
-
-        entity_unit = entity_dict.get(KEY_UNIT, "").upper()
-
-        match entity_unit:
-            case "C":
-                return UnitOfTemperature.CELSIUS
-            case "F":
-                return UnitOfTemperature.FAHRENHEIT
-            case "%RH":
-                return PERCENTAGE
-            case "HPA":
-                return UnitOfPressure.PA
-            case "PPB":
-                return CONCENTRATION_PARTS_PER_BILLION
-            case "PPM":
-                return CONCENTRATION_PARTS_PER_MILLION
-            case "V":
-                return UnitOfElectricPotential.VOLT
-            case _:
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.warning(
-                        "Unknown unit [%s] for sensor [%s]",
-                        entity_unit,
-                        self.entity_description.key,
-                    )
-                return None
+        measurement = self.measurement
+        return measurement.unit if measurement else None
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return additional attributes for the value sensor (Status)."""
-        entity_dict = self.kidde_device.get(self.entity_description.key)
-        attribute_dict = None
-        if isinstance(entity_dict, dict):
-            attribute_dict = {"Status": entity_dict.get(KEY_STATUS)}
-        else:
-            ktype = type(entity_dict)
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.warning(
-                    "Unexpected type [%s], expected state attributes dict for [%s]",
-                    ktype,
-                    self.entity_description.key,
-                )
-            attribute_dict = {"Status": None}
-        return attribute_dict
+        measurement = self.measurement
+        return {"Status": measurement.status if measurement else None}
+
+
+class KiddePredictionSensorEntity(KiddeEntity, SensorEntity):
+    """Sensor predicting when a device's battery or life runs out.
+
+    The prediction extrapolates the trend of the device's values, and is unknown
+    until there is enough history or while the trend is not falling.
+    """
+
+    entity_description: KiddePredictionSensorEntityDescription
+
+    @property
+    def native_value(self) -> datetime.datetime | None:
+        """Return the predicted date."""
+        device = self.kidde_device
+        for key in self.entity_description.trend_keys:
+            if key in device:
+                return self.coordinator.trends.predict(self.device_id, key)
+        return None
+
+
+class KiddeDiagnosticsSensorEntity(KiddeEntity, SensorEntity):
+    """Consolidated diagnostics sensor for compact mode.
+
+    Reports when the device was last seen, and carries the values of the
+    entities that compact mode leaves out as attributes.
+    """
+
+    _unrecorded_attributes = DIAGNOSTICS_UNRECORDED_KEYS
+
+    @property
+    def native_value(self) -> datetime.datetime | None:
+        """Return when the device was last seen."""
+        return self.kidde_device.get(KEY_LAST_SEEN)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the values of the device's non safety-critical keys."""
+        device = self.kidde_device
+        attributes = {}
+        for key in DIAGNOSTICS_ATTRIBUTE_KEYS:
+            if key == KEY_LAST_SEEN or key not in device:
+                continue
+            value = device[key]
+            if isinstance(value, KiddeMeasurement):
+                attributes[key] = value.value
+                attributes[f"{key}_unit"] = value.unit
+                attributes[f"{key}_status"] = value.status
+            else:
+                attributes[key] = value
+        return attributes
+
+
+class KiddeRateBudgetSensorEntity(KiddeAccountEntity, SensorEntity):
+    """Diagnostic sensor reporting the requests left in the account's budget."""
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        budget: KiddeRateBudget,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        super().__init__(entry, entity_description)
+        self.budget = budget
+
+    async def async_added_to_hass(self) -> None:
+        """Write state when the budget changes, at most once per cooldown.
+
+        Every refresh takes from the budget, so writing on every change would
+        record a state for every poll, even when no device changed.
+        """
+        await super().async_added_to_hass()
+        debouncer = Debouncer(
+            self.hass,
+            logger,
+            cooldown=RATE_BUDGET_SENSOR_COOLDOWN,
+            immediate=True,
+            function=self.async_write_ha_state,
+        )
+        self.async_on_remove(debouncer.async_shutdown)
+        self.async_on_remove(
+            self.budget.async_add_listener(debouncer.async_schedule_call)
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the number of requests that can be made right now."""
+        return round(self.budget.tokens, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the budget's limits, deferred requests and counters."""
+        return {
+            "capacity": self.budget.capacity,
+            "per_minute": self.budget.per_minute,
+            "waiting": self.budget.waiting,
+            **self.budget.counters,
+        }
+
+
+class KiddeAlarmLatencySensorEntity(KiddeAccountEntity, SensorEntity):
+    """Diagnostic sensor reporting how late alarms reach Home Assistant.
+
+    The state is the median latency from a device reporting an alarm to its
+    binary sensor being written, with the other percentiles as attributes.
+    """
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        alarm_latency: KiddeAlarmLatency,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        super().__init__(entry, entity_description)
+        self.alarm_latency = alarm_latency
+
+    async def async_added_to_hass(self) -> None:
+        """Write state whenever an alarm latency is recorded."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.alarm_latency.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median alarm latency."""
+        return self.alarm_latency.overall.as_dict().get("p50")
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the count, mean, extremes and percentiles of the latency."""
+        return self.alarm_latency.overall.as_dict()
@@ -0,0 +1,76 @@
+"""Services for the Kidde HomeSafe integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .account import KiddeAccount
+
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD_TRACE = "record_trace"
+
+ATTR_DURATION = "duration"
+ATTR_REFRESHES = "refreshes"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_REFRESHES, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+RECORD_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=timedelta(hours=24)): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+    }
+)
+
+
+def _loaded_accounts(hass: HomeAssistant) -> list[KiddeAccount]:
+    """Return the accounts of the loaded config entries."""
+    if not (accounts := list(hass.data.get(DOMAIN, {}).values())):
+        raise HomeAssistantError("No Kidde HomeSafe account is loaded")
+    return accounts
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Kidde HomeSafe services."""
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next refreshes of every account."""
+        accounts = _loaded_accounts(hass)
+        # Check every account first, so a busy one does not leave the others
+        # profiling without a report being asked for
+        if busy := [
+            str(account.profile_path) for account in accounts if account.profile_path
+        ]:
+            raise HomeAssistantError(
+                f"Already profiling Kidde refreshes to {', '.join(busy)}"
+            )
+        for account in accounts:
+            account.async_profile(call.data[ATTR_REFRESHES])
+
+    async def async_record_trace(call: ServiceCall) -> None:
+        """Record a trace of every account's refreshes."""
+        for account in _loaded_accounts(hass):
+            await account.async_record_trace(call.data[ATTR_DURATION])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RECORD_TRACE, async_record_trace, schema=RECORD_TRACE_SCHEMA
+    )
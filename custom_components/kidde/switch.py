@@ -3,17 +3,18 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .account import KiddeAccount
 from .const import DOMAIN
 from .coordinator import KiddeCoordinator
-from .entity import KiddeCommand, KiddeEntity
+from .descriptions.switch import SWITCH_DESCRIPTIONS, KiddeSwitchEntityDescription
+from .entity import KiddeEntity
 
 # Constants for dictionary keys
 KEY_MODEL = "model"
@@ -21,53 +22,30 @@ KEY_MODEL = "model"
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class KiddeSwitchEntityDescriptionMixin:
-    """Mixin for required keys."""
-
-    kidde_command_on: KiddeCommand
-    kidde_command_off: KiddeCommand
-
-
-@dataclass
-class KiddeSwitchEntityDescription(
-    SwitchEntityDescription, KiddeSwitchEntityDescriptionMixin
-):
-    """Describes Kidde Switch entity."""
-
-
-_SWITCH_DESCRIPTIONS = (
-    KiddeSwitchEntityDescription(
-        key="identifying",
-        name="Identifying",
-        icon="mdi:home-sound-out",
-        kidde_command_on=KiddeCommand.IDENTIFY,
-        kidde_command_off=KiddeCommand.IDENTIFYCANCEL,
-    ),
-)
-
-
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
 ) -> None:
     """Set up the switch platform."""
-    coordinator: KiddeCoordinator = hass.data[DOMAIN][entry.entry_id]
+    account: KiddeAccount = hass.data[DOMAIN][entry.entry_id]
+    account.async_add_device_entities(async_add_devices, _device_switches)
+
+
+def _device_switches(
+    coordinator: KiddeCoordinator, device_id: int, device_data: dict
+) -> list[SwitchEntity]:
+    """Create the switches of a device."""
     switches: list[SwitchEntity] = []
 
-    for device_id, device_data in coordinator.data.devices.items():
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(
-                "Checking model: [%s]",
-                coordinator.data.devices[device_id].get(KEY_MODEL, "Unknown"),
-            )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checking model: [%s]", device_data.get(KEY_MODEL, "Unknown"))
 
-        for entity_description in _SWITCH_DESCRIPTIONS:
-            if entity_description.key in device_data:
-                switches.append(
-                    KiddeSwitchEntity(coordinator, device_id, entity_description)
-                )
+    for entity_description in SWITCH_DESCRIPTIONS:
+        if entity_description.key in device_data:
+            switches.append(
+                KiddeSwitchEntity(coordinator, device_id, entity_description)
+            )
 
-    async_add_devices(switches)
+    return switches
 
 
 class KiddeSwitchEntity(KiddeEntity, SwitchEntity):
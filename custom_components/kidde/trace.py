@@ -0,0 +1,120 @@
+"""Recording of Kidde HomeSafe device payloads for offline policy simulation.
+
+A trace is a gzip compressed JSON lines file. The first line is a header, and
+every following line is a refresh: its time and the redacted payloads of the
+devices that changed since the previous refresh. Unchanged refreshes only cost
+a timestamp. Replay traces with scripts/simulate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant, callback
+
+from .const import TO_REDACT, TRACE_FLUSH_LINES
+
+TRACE_VERSION = 1
+
+
+class KiddeTraceRecorder:
+    """Append refreshes of an account to a trace file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        locations: int,
+        update_interval: int,
+    ) -> None:
+        """Initialize the recorder and queue the trace header."""
+        self._hass = hass
+        self.path = path
+        self.refreshes = 0
+        # Devices whose full payload has been recorded
+        self._devices: set[int] = set()
+        self._lines: list[str] = []
+        self._pending: asyncio.Task[None] | None = None
+        self._add_line(
+            {
+                "v": TRACE_VERSION,
+                "started": round(time.time(), 3),
+                "locations": locations,
+                "update_interval": update_interval,
+            }
+        )
+
+    @callback
+    def async_add(self, devices: dict[int, dict[str, Any]], changed: set[int]) -> None:
+        """Record a refresh and the raw payloads of the devices that changed."""
+        # The first refresh of a device is recorded in full, so replays start
+        # from the complete state of the account
+        changed = changed | (devices.keys() - self._devices)
+        self._devices |= changed
+        line: dict[str, Any] = {"t": round(time.time(), 3)}
+        if changed:
+            line["d"] = async_redact_data(
+                {str(device_id): devices[device_id] for device_id in changed},
+                TO_REDACT,
+            )
+        self._add_line(line)
+        self.refreshes += 1
+        if len(self._lines) >= TRACE_FLUSH_LINES:
+            self._async_flush()
+
+    async def async_close(self) -> None:
+        """Write any buffered refreshes to disk."""
+        self._async_flush()
+        if self._pending:
+            await self._pending
+
+    def _add_line(self, line: dict[str, Any]) -> None:
+        """Buffer a line of the trace."""
+        self._lines.append(json.dumps(line, separators=(",", ":"), default=str))
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write the buffered lines in the executor, after any earlier write."""
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        self._pending = self._hass.async_create_task(
+            self._async_write(lines, self._pending)
+        )
+
+    async def _async_write(
+        self, lines: list[str], previous: asyncio.Task[None] | None
+    ) -> None:
+        """Append lines to the trace file."""
+        if previous:
+            await previous
+        await self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the trace file as a new gzip member."""
+        with gzip.open(self.path, "at", encoding="utf-8") as trace:
+            trace.write("\n".join(lines) + "\n")
+
+
+def read_trace(path: Path) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+    """Read a trace file, returning its header and an iterator of refreshes."""
+    trace = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(trace.readline())
+    if header.get("v") != TRACE_VERSION:
+        trace.close()
+        raise ValueError(f"Unsupported trace version: {header.get('v')}")
+
+    def refreshes() -> Iterator[dict[str, Any]]:
+        with trace:
+            for line in trace:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, refreshes()
@@ -0,0 +1,132 @@
+"""Fixtures for Kidde HomeSafe tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from kidde_homesafe import KiddeClientAuthError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.const import DOMAIN
+
+EMAIL = "me@example.com"
+
+
+def make_device(device_id: int, location_id: int, model: str, **values: Any) -> dict:
+    """Return a device payload as reported by the Kidde API."""
+    device = {
+        "id": device_id,
+        "location_id": location_id,
+        "label": f"Detector {device_id}",
+        "model": model,
+        "serial_number": f"SN{device_id:06}",
+        "hwrev": 1,
+        "fwrev": 102,
+        "ssid": "home-network",
+        "last_seen": "2024-06-14T03:40:39.667544824Z",
+        "smoke_alarm": False,
+        "co_alarm": False,
+        "low_battery_alarm": False,
+        "offline": False,
+        "battery_state": "ok",
+        "batt_volt": "3.05",
+        "life": 420,
+        "ap_rssi": -52,
+    }
+    if model == "wifiiaqdetector":
+        device |= {
+            "iaq_temperature": {"value": 21.5, "status": "Good", "Unit": "C"},
+            "humidity": {"value": 41, "status": "Good", "Unit": "%RH"},
+            "hpa": {"value": 1010.2, "status": "Normal", "Unit": "hPa"},
+            "tvoc": {"value": 605.09, "status": "Moderate", "Unit": "ppb"},
+        }
+    if model == "waterleakdetector":
+        device |= {"water_alarm": False, "low_temp_alarm": False, "temperature": 20}
+    return device | values
+
+
+class FakeKiddeClient:
+    """In-memory stand-in for KiddeClient.
+
+    Serves locations and their devices, with optional per-location delays and
+    failures, and records every request it receives.
+    """
+
+    def __init__(self, cookies: dict[str, str] | None = None) -> None:
+        """Initialize the client with two locations."""
+        self.cookies = cookies or {}
+        self.locations: dict[int, dict] = {
+            1: {"id": 1, "label": "Home"},
+            2: {"id": 2, "label": "Cabin"},
+        }
+        self.devices: dict[int, list[dict]] = {
+            1: [
+                make_device(11, 1, "wifiiaqdetector"),
+                make_device(12, 1, "cowifidetector"),
+            ],
+            2: [make_device(21, 2, "waterleakdetector")],
+        }
+        self.delays: dict[int, float] = {}
+        self.failures: dict[int, Exception] = {}
+        self.auth_failed = False
+        self.requests: list[str] = []
+        self.commands: list[tuple[int, int, str]] = []
+
+    async def _request(self, path: str, method: str = "GET") -> Any:
+        """Serve a request from memory."""
+        self.requests.append(path)
+        if self.auth_failed:
+            raise KiddeClientAuthError
+        if path == "location":
+            return list(self.locations.values())
+        location_id = int(path.split("/")[1])
+        if delay := self.delays.get(location_id):
+            await asyncio.sleep(delay)
+        if error := self.failures.get(location_id):
+            raise error
+        return self.devices[location_id]
+
+    async def device_command(
+        self, location_id: int, device_id: int, command: str
+    ) -> None:
+        """Record a device command."""
+        self.commands.append((location_id, device_id, command))
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading the integration from custom_components."""
+
+
+@pytest.fixture
+def fake_client() -> FakeKiddeClient:
+    """Return the fake client the integration will use."""
+    return FakeKiddeClient()
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry for the integration, added to Home Assistant."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Kidde ({EMAIL})",
+        data={"cookies": {"session": "secret-cookie"}, "update_interval": 60},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def setup_integration(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> AsyncGenerator[MockConfigEntry, None]:
+    """Set up the integration with the fake client."""
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+        yield config_entry
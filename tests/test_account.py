@@ -0,0 +1,106 @@
+"""Tests for the Kidde HomeSafe account manager."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from aiohttp import ClientError
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.kidde.account import KiddeAccount
+from custom_components.kidde.const import (
+    CONF_SHARD_LOCATIONS,
+    DOMAIN,
+    LOCATION_REFRESH_INTERVAL,
+)
+
+from .conftest import FakeKiddeClient, make_device
+
+
+async def _setup_sharded(
+    hass: HomeAssistant, entry: MockConfigEntry, client: FakeKiddeClient
+) -> KiddeAccount:
+    """Set up the entry with one coordinator per location."""
+    hass.config_entries.async_update_entry(entry, options={CONF_SHARD_LOCATIONS: True})
+    with patch("kidde_homesafe.KiddeClient", return_value=client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def _check_locations(hass: HomeAssistant) -> None:
+    """Let a sharded account check its locations."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=LOCATION_REFRESH_INTERVAL)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_sharded_location_added(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test a location added after setup gets a coordinator and entities."""
+    account = await _setup_sharded(hass, config_entry, fake_client)
+    assert set(account.coordinators) == {1, 2}
+
+    fake_client.locations[3] = {"id": 3, "label": "Garage"}
+    fake_client.devices[3] = [make_device(31, 3, "wifidetector")]
+    await _check_locations(hass)
+
+    assert set(account.coordinators) == {1, 2, 3}
+    assert account.coordinators[3].last_update_success
+    assert hass.states.get("binary_sensor.detector_31_smoke_alarm").state == "off"
+    assert hass.states.get("button.detector_31_test") is not None
+
+
+async def test_sharded_location_removed(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test a removed location's coordinator is retired with its entities."""
+    account = await _setup_sharded(hass, config_entry, fake_client)
+    coordinator = account.coordinators[2]
+    entity_count = account.entity_count
+
+    del fake_client.locations[2]
+    await _check_locations(hass)
+
+    assert set(account.coordinators) == {1}
+    assert not coordinator._listeners
+    assert coordinator._unsub_refresh is None
+    # Left in the entity registry, so restored as unavailable
+    state = hass.states.get("binary_sensor.detector_21_water_alert")
+    assert state.state == STATE_UNAVAILABLE
+    assert state.attributes["restored"]
+    assert hass.states.get("binary_sensor.detector_11_smoke_alarm").state == "off"
+    assert account.entity_count < entity_count
+
+    requests = len(fake_client.requests)
+    await _check_locations(hass)
+    assert "location/2/device" not in fake_client.requests[requests:]
+
+    fake_client.locations[2] = {"id": 2, "label": "Cabin"}
+    await _check_locations(hass)
+    assert account.entity_count == entity_count
+    assert hass.states.get("binary_sensor.detector_21_water_alert").state == "off"
+
+
+async def test_sharded_location_check_failure(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test a failed location check keeps the existing coordinators."""
+    account = await _setup_sharded(hass, config_entry, fake_client)
+
+    with patch(
+        "custom_components.kidde.account.async_get_locations",
+        side_effect=ClientError("down"),
+    ):
+        await _check_locations(hass)
+
+    assert set(account.coordinators) == {1, 2}
@@ -0,0 +1,125 @@
+"""Tests for the Kidde HomeSafe trends."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.analytics import DAY, KiddeTrend, KiddeTrends
+from custom_components.kidde.const import (
+    BATTERY_DEPLETED_VOLTAGE,
+    DOMAIN,
+    TREND_MIN_SAMPLES,
+    TREND_SAMPLE_INTERVAL,
+    TREND_SIZE,
+)
+
+from .conftest import FakeKiddeClient, make_device
+
+START = 1718336439.0
+# A battery falling 0.01 V a day from 3.0 V is depleted at 2.6 V on day 40
+DEPLETED = dt_util.utc_from_timestamp(START + 40 * DAY)
+
+
+def _voltage(day: float) -> float:
+    """Return the battery voltage on a day of a linear decline."""
+    return 3.0 - 0.01 * day
+
+
+def _declining_trend(samples: int, interval: float = DAY) -> KiddeTrend:
+    """Return a trend of a linearly declining battery voltage."""
+    trend = KiddeTrend(START)
+    for sample in range(samples):
+        assert trend.add(START + sample * interval, _voltage(sample * interval / DAY))
+    return trend
+
+
+def test_trend_predicts_linear_decline() -> None:
+    """Test a linear decline is predicted to reach its target on time."""
+    assert (
+        _declining_trend(TREND_MIN_SAMPLES - 1).predict(BATTERY_DEPLETED_VOLTAGE) is None
+    )
+
+    predicted = _declining_trend(TREND_MIN_SAMPLES).predict(BATTERY_DEPLETED_VOLTAGE)
+    assert predicted.timestamp() == pytest.approx(DEPLETED.timestamp(), abs=1)
+
+
+def test_trend_drops_close_samples() -> None:
+    """Test samples closer than the sample interval are dropped."""
+    trend = KiddeTrend(START)
+    assert trend.add(START, 3.0)
+    assert not trend.add(START + TREND_SAMPLE_INTERVAL - 1, 2.0)
+    assert trend.add(START + TREND_SAMPLE_INTERVAL, 2.99)
+
+    assert list(trend.samples) == [(0.0, 3.0), (TREND_SAMPLE_INTERVAL / DAY, 2.99)]
+
+
+def test_trend_evicts_oldest_samples() -> None:
+    """Test only the last samples are kept, and removed from the regression."""
+    evicted = 10
+    trend = _declining_trend(TREND_SIZE + evicted, TREND_SAMPLE_INTERVAL)
+
+    assert len(trend.samples) == TREND_SIZE
+    assert trend.samples[0][0] == pytest.approx(evicted * TREND_SAMPLE_INTERVAL / DAY)
+    assert trend._sum_t == pytest.approx(sum(t for t, _ in trend.samples))
+    assert trend._sum_tv == pytest.approx(sum(t * v for t, v in trend.samples))
+    predicted = trend.predict(BATTERY_DEPLETED_VOLTAGE)
+    assert predicted.timestamp() == pytest.approx(DEPLETED.timestamp(), abs=1)
+
+
+async def test_trends_survive_store_round_trip(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test trends saved on shutdown are loaded with the same prediction."""
+    trends = KiddeTrends(hass, "entry")
+    await trends.async_load()
+    for day in range(TREND_MIN_SAMPLES):
+        trends.async_add(12, {"batt_volt": _voltage(day)}, START + day * DAY)
+    predicted = trends.predict(12, "batt_volt")
+    await trends.async_shutdown()
+    assert f"{DOMAIN}.entry.trends" in hass_storage
+
+    loaded = KiddeTrends(hass, "entry")
+    await loaded.async_load()
+
+    assert loaded.predict(12, "batt_volt") == predicted
+    assert predicted.timestamp() == pytest.approx(DEPLETED.timestamp(), abs=1)
+    assert loaded.predict(12, "life") is None
+
+
+async def test_prediction_sensor_after_min_samples(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test the battery depletion sensor has a value once there are enough samples."""
+    entity_id = "sensor.detector_12_predicted_battery_depletion"
+    clock = Mock(monotonic=time.monotonic)
+
+    def set_day(day: int) -> None:
+        """Set the clock and battery voltage of a day."""
+        clock.time.return_value = START + day * DAY
+        fake_client.devices[1][1] = make_device(
+            12, 1, "cowifidetector", batt_volt=f"{_voltage(day):.2f}"
+        )
+
+    with patch("custom_components.kidde.coordinator.time", clock):
+        set_day(0)
+        with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+            assert await hass.config_entries.async_setup(config_entry.entry_id)
+            await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][config_entry.entry_id].coordinators[None]
+        coordinator.budget.acquire = AsyncMock()
+
+        for day in range(1, TREND_MIN_SAMPLES):
+            assert hass.states.get(entity_id).state == "unknown"
+            set_day(day)
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+    predicted = dt_util.parse_datetime(hass.states.get(entity_id).state)
+    assert predicted.timestamp() == pytest.approx(DEPLETED.timestamp(), abs=1)
@@ -0,0 +1,243 @@
+"""Tests for the Kidde HomeSafe coordinator."""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Generator
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp import ClientError
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.const import CONF_IGNORE_LAST_SEEN, DOMAIN
+from custom_components.kidde.coordinator import KiddeCoordinator
+from custom_components.kidde.entity import KiddeEntity
+
+from .conftest import FakeKiddeClient, make_device
+
+
+def _coordinator(hass: HomeAssistant, entry: MockConfigEntry) -> KiddeCoordinator:
+    """Return the coordinator of an account that is not sharded."""
+    return hass.data[DOMAIN][entry.entry_id].coordinators[None]
+
+
+@contextmanager
+def _count_writes() -> Generator[Counter[int], None, None]:
+    """Count the state writes of device entities, by device ID."""
+    writes: Counter[int] = Counter()
+    write = Entity.async_write_ha_state
+
+    def counting_write(entity: Entity) -> None:
+        if isinstance(entity, KiddeEntity):
+            writes[entity.device_id] += 1
+        write(entity)
+
+    with patch.object(Entity, "async_write_ha_state", counting_write):
+        yield writes
+
+
+async def test_locations_fetched_concurrently(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+) -> None:
+    """Test a refresh takes about as long as its slowest location."""
+    for location_id in (3, 4):
+        fake_client.locations[location_id] = {"id": location_id}
+        fake_client.devices[location_id] = [
+            make_device(location_id * 10 + 1, location_id, "wifidetector")
+        ]
+    fake_client.delays = {1: 0.1, 2: 0.3, 3: 0.2, 4: 0.2}
+    coordinator = _coordinator(hass, setup_integration)
+
+    start = time.monotonic()
+    await coordinator.async_refresh()
+    elapsed = time.monotonic() - start
+
+    assert coordinator.last_update_success
+    assert set(coordinator.data.devices) == {11, 12, 21, 31, 41}
+    # The locations take 0.8 s in total when fetched one after another
+    assert 0.3 <= elapsed < 0.5
+
+
+async def test_failing_location_keeps_previous_devices(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+) -> None:
+    """Test a failing location yields a partial refresh rather than a failure."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.devices[1][0] = make_device(11, 1, "wifiiaqdetector", smoke_alarm=True)
+    fake_client.failures[2] = ClientError("Cabin is offline")
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.counters["partial_refreshes"] == 1
+    assert coordinator.data.devices[11]["smoke_alarm"] is True
+    assert coordinator.data.devices[21]["label"] == "Detector 21"
+
+
+async def test_every_location_failing_fails_refresh(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+) -> None:
+    """Test a refresh fails when no location could be fetched."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.failures = {1: ClientError("down"), 2: ClientError("down")}
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+
+
+async def test_duplicate_device_across_locations_logged(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a device reported by two locations is logged and counted."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.devices[2].append(make_device(11, 2, "wifidetector"))
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.counters["duplicate_devices"] == 1
+    assert "reported by more than one location" in caplog.text
+
+
+async def test_duplicate_device_within_location_rejected(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+) -> None:
+    """Test a location listing a device twice is treated as failed."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.devices[2].append(make_device(21, 2, "waterleakdetector"))
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.counters["partial_refreshes"] == 1
+
+
+async def test_unchanged_refresh_skipped(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test an identical payload is counted and writes no entity states."""
+    coordinator = _coordinator(hass, setup_integration)
+
+    with _count_writes() as writes:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert coordinator.counters["unchanged_refreshes"] == 1
+    assert not writes
+
+
+async def test_only_changed_device_written(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+) -> None:
+    """Test only the entities of the device that changed are written."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.devices[1][1] = make_device(12, 1, "cowifidetector", co_alarm=True)
+
+    with _count_writes() as writes:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert coordinator.changed_devices == {12}
+    assert coordinator.counters["unchanged_devices"] == 2
+    assert set(writes) == {12}
+    assert hass.states.get("binary_sensor.detector_12_co_alarm").state == "on"
+
+
+async def test_every_entity_written_after_recovery(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+) -> None:
+    """Test every entity is written again once the API recovers from a failure."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.failures = {1: ClientError("down"), 2: ClientError("down")}
+    await coordinator.async_refresh()
+    assert hass.states.get("binary_sensor.detector_11_smoke_alarm").state == (
+        "unavailable"
+    )
+
+    fake_client.failures = {}
+    with _count_writes() as writes:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert coordinator.changed_devices == {11, 12, 21}
+    assert set(writes) == {11, 12, 21}
+    assert hass.states.get("binary_sensor.detector_11_smoke_alarm").state == "off"
+
+
+@pytest.mark.parametrize(("ignore_last_seen", "unchanged"), [(False, 0), (True, 1)])
+async def test_ignore_last_seen_option(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    ignore_last_seen: bool,
+    unchanged: int,
+) -> None:
+    """Test a refresh that only updates last seen is skipped when configured."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_IGNORE_LAST_SEEN: ignore_last_seen}
+    )
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = _coordinator(hass, config_entry)
+    fake_client.devices[2][0]["last_seen"] = "2024-06-14T03:45:39.667544824Z"
+
+    await coordinator.async_refresh()
+
+    assert coordinator.counters["unchanged_refreshes"] == unchanged
+
+
+async def test_failing_location_devices_unavailable(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing location's devices are unavailable until it recovers."""
+    coordinator = _coordinator(hass, setup_integration)
+    fake_client.devices[2][0] = make_device(21, 2, "waterleakdetector", water_alarm=True)
+    fake_client.failures[2] = ClientError("Cabin is offline")
+    # Seven refreshes would otherwise wait for the rate budget to refill
+    coordinator.budget.acquire = AsyncMock()
+
+    for _ in range(5):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert coordinator.failed_locations == {2: 5}
+    assert caplog.text.count("failed to refresh") == 1
+    water_alert = "binary_sensor.detector_21_water_alert"
+    assert hass.states.get(water_alert).state == STATE_UNAVAILABLE
+    assert hass.states.get("binary_sensor.detector_11_smoke_alarm").state == "off"
+
+    del fake_client.failures[2]
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.failed_locations == {}
+    assert caplog.text.count("recovered after 5 failed refreshes") == 1
+    assert hass.states.get(water_alert).state == "on"
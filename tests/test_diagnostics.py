@@ -0,0 +1,22 @@
+"""Tests for the Kidde HomeSafe diagnostics."""
+
+import json
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.diagnostics import async_get_config_entry_diagnostics
+
+from .conftest import EMAIL
+
+
+async def test_diagnostics_redacted(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test no account or device secrets survive in the diagnostics."""
+    diagnostics = await async_get_config_entry_diagnostics(hass, setup_integration)
+    dump = json.dumps(diagnostics, default=str)
+
+    assert diagnostics["coordinators"]["account"]["payloads"]
+    for secret in (EMAIL, "secret-cookie", "SN000011", "home-network"):
+        assert secret not in dump
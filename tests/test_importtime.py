@@ -0,0 +1,93 @@
+"""Import time tests for the Kidde HomeSafe integration.
+
+Home Assistant imports the integration package long before any config entry
+is set up, so the package must not pull in the API client, the coordinator or
+the entity platforms. Imports are measured in a fresh interpreter, with the
+modules Home Assistant itself has already loaded at that point imported first
+so they are not charged to us.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CUSTOM_COMPONENTS = Path(__file__).parent.parent / "custom_components"
+
+# Import time budget for the integration package, in microseconds
+IMPORT_BUDGET_US = 20000
+
+PRELOADED = """
+import homeassistant.config_entries
+import homeassistant.const
+import homeassistant.core
+import homeassistant.helpers.config_validation
+"""
+
+DEFERRED = (
+    "kidde_homesafe",
+    "kidde.account",
+    "kidde.coordinator",
+    "kidde.descriptions",
+    "kidde.trace",
+)
+
+ENTITY_COMPONENTS = ("binary_sensor", "button", "sensor", "switch")
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a fresh interpreter that can import the integration."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, (env.get("PYTHONPATH"), str(CUSTOM_COMPONENTS)))
+    )
+    result = subprocess.run(
+        [sys.executable, *options, "-c", PRELOADED + code],
+        capture_output=True,
+        check=False,
+        env=env,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def _loaded(code: str, names: tuple[str, ...]) -> list[str]:
+    """Return which of the named modules are loaded after running code."""
+    result = _run(
+        code + f"\nimport sys\nprint(*[n for n in {names!r} if n in sys.modules])"
+    )
+    return result.stdout.split()
+
+
+def test_integration_import_time() -> None:
+    """Test importing the integration package stays within its budget."""
+    result = _run("import kidde", "-X", "importtime")
+    cumulative = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "kidde"
+    )
+    assert cumulative <= IMPORT_BUDGET_US
+
+
+def test_integration_defers_heavy_imports() -> None:
+    """Test importing the integration package defers the client and platforms."""
+    assert _loaded("import kidde", DEFERRED) == []
+
+
+@pytest.mark.parametrize("platform", ENTITY_COMPONENTS)
+def test_platform_imports_only_its_component(platform: str) -> None:
+    """Test a platform does not import the entity components of the others."""
+    components = tuple(
+        f"homeassistant.components.{component}" for component in ENTITY_COMPONENTS
+    )
+    expected = {f"homeassistant.components.{platform}"}
+    if platform == "sensor":
+        # The compact diagnostics sensor carries the binary sensor values
+        expected.add("homeassistant.components.binary_sensor")
+    assert set(_loaded(f"import kidde.{platform}", components)) == expected
@@ -0,0 +1,82 @@
+"""Tests for setting up the Kidde HomeSafe integration."""
+
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.const import DOMAIN
+
+from .conftest import EMAIL, FakeKiddeClient, make_device
+
+
+async def test_setup_and_unload(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test the entry sets up its entities and unloads."""
+    assert setup_integration.state is ConfigEntryState.LOADED
+    assert hass.states.get("binary_sensor.detector_11_smoke_alarm").state == "off"
+
+    assert await hass.config_entries.async_unload(setup_integration.entry_id)
+    await hass.async_block_till_done()
+    assert setup_integration.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_account_device_hides_email(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test the account email is not in device names, entity IDs or states."""
+    entry_id = setup_integration.entry_id
+    devices = dr.async_entries_for_config_entry(dr.async_get(hass), entry_id)
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry_id)
+    assert "Kidde HomeSafe account" in {device.name for device in devices}
+    assert "sensor.kidde_homesafe_account_api_budget" in {
+        entity.entity_id for entity in entities
+    }
+
+    email_parts = ("example", EMAIL)
+    for device in devices:
+        assert not any(part in device.name for part in email_parts)
+    for state in hass.states.async_all():
+        assert not any(part in state.entity_id for part in email_parts)
+        assert not any(part in state.name for part in email_parts)
+
+
+async def test_new_device_forwards_platform(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test a device needing a new platform sets it up once the entry is loaded."""
+    fake_client.locations = {2: fake_client.locations[2]}
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    account = hass.data[DOMAIN][config_entry.entry_id]
+    assert Platform.BUTTON not in account.platforms
+
+    fake_client.devices[2].append(make_device(22, 2, "wifidetector"))
+    await account.coordinators[None].async_refresh()
+    await hass.async_block_till_done()
+
+    assert Platform.BUTTON in account.platforms
+    assert hass.states.get("button.detector_22_test") is not None
+
+
+async def test_remove_entry_removes_trends(
+    hass: HomeAssistant,
+    setup_integration: MockConfigEntry,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test removing the entry removes its stored trends."""
+    key = f"{DOMAIN}.{setup_integration.entry_id}.trends"
+    assert await hass.config_entries.async_unload(setup_integration.entry_id)
+    await hass.async_block_till_done()
+    assert key in hass_storage
+
+    await hass.config_entries.async_remove(setup_integration.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
@@ -0,0 +1,129 @@
+"""Tests for the Kidde HomeSafe alarm latency measurement."""
+
+from __future__ import annotations
+
+import math
+import random
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.const import (
+    DOMAIN,
+    LATENCY_MAX_BUCKETS,
+    LATENCY_RELATIVE_ACCURACY,
+)
+from custom_components.kidde.coordinator import KiddeCoordinator
+from custom_components.kidde.latency import (
+    QUANTILES,
+    KiddeAlarmLatency,
+    KiddeLatencySketch,
+)
+
+from .conftest import FakeKiddeClient, make_device
+
+SAMPLES = 10000
+# The alarm is reported this long before the refresh that writes it
+REPORTED_AGO = timedelta(seconds=30)
+
+
+def _exact_quantile(values: list[float], quantile: float) -> float:
+    """Return the sample at a quantile, ranked as the sketch ranks it."""
+    return sorted(values)[math.floor(quantile * (len(values) - 1))]
+
+
+@pytest.mark.parametrize("quantile", QUANTILES.values())
+def test_sketch_quantile_accuracy(quantile: float) -> None:
+    """Test quantiles are within the relative accuracy of the exact ones."""
+    rng = random.Random(26)
+    values = [rng.lognormvariate(3, 1.5) for _ in range(SAMPLES)]
+    sketch = KiddeLatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    exact = _exact_quantile(values, quantile)
+    assert sketch.count == SAMPLES
+    assert sketch.quantile(quantile) == pytest.approx(
+        exact, rel=LATENCY_RELATIVE_ACCURACY
+    )
+
+
+def test_sketch_bounded_buckets() -> None:
+    """Test the buckets stay bounded and the high quantiles accurate."""
+    values = [1.01**exponent for exponent in range(3000)]
+    sketch = KiddeLatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch._buckets) == LATENCY_MAX_BUCKETS
+    assert sketch.count == len(values)
+    assert sketch.max == values[-1]
+    for quantile in (0.9, 0.99):
+        assert sketch.quantile(quantile) == pytest.approx(
+            _exact_quantile(values, quantile), rel=LATENCY_RELATIVE_ACCURACY
+        )
+
+
+def _co_detector(**values: object) -> dict:
+    """Return the CO detector of the fake client, last seen a while ago."""
+    last_seen = dt_util.utcnow() - REPORTED_AGO
+    return make_device(
+        12,
+        1,
+        "cowifidetector",
+        last_seen=last_seen.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        **values,
+    )
+
+
+async def _setup(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> tuple[KiddeCoordinator, KiddeAlarmLatency]:
+    """Set up the integration and return its coordinator and alarm latency."""
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    account = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = account.coordinators[None]
+    coordinator.budget.acquire = AsyncMock()
+    return coordinator, account.alarm_latency
+
+
+async def test_alarm_onset_recorded_once(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test an alarm turning on records a single latency."""
+    coordinator, alarm_latency = await _setup(hass, config_entry, fake_client)
+    assert alarm_latency.overall.count == 0
+
+    fake_client.devices[1][1] = _co_detector(co_alarm=True)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    # Still on, so nothing more is recorded
+    fake_client.devices[1][1] = _co_detector(co_alarm=True, ap_rssi=-60)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert alarm_latency.overall.count == 1
+    assert list(alarm_latency.by_alarm) == [(12, "co_alarm")]
+    latency = alarm_latency.overall.max
+    assert REPORTED_AGO.total_seconds() <= latency < REPORTED_AGO.total_seconds() + 2
+
+
+async def test_alarm_already_on_not_recorded(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test an alarm already on when its entity is added records nothing."""
+    fake_client.devices[1][1] = _co_detector(co_alarm=True)
+    coordinator, alarm_latency = await _setup(hass, config_entry, fake_client)
+
+    fake_client.devices[1][1] = _co_detector(co_alarm=True, ap_rssi=-60)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.detector_12_co_alarm").state == "on"
+    assert alarm_latency.overall.count == 0
@@ -0,0 +1,84 @@
+"""Tests for the Kidde HomeSafe rate budget."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.kidde.ratelimit import KiddePriority, KiddeRateBudget
+
+CAPACITY = 5
+PER_MINUTE = 1200  # 20 requests per second
+
+
+class FakeRateLimitedApi:
+    """Fake API enforcing a token bucket rate limit like the Kidde cloud's."""
+
+    def __init__(self, capacity: int, per_minute: float) -> None:
+        """Initialize the API with a full bucket."""
+        self.capacity = capacity
+        self.per_second = per_minute / 60
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.served: list[str] = []
+        self.rejected = 0
+
+    async def request(self, name: str, cost: int = 1) -> None:
+        """Serve a request, rejecting it if the rate limit is exceeded."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.per_second
+        )
+        self.updated = now
+        # Allow for float rounding in the elapsed time
+        if self.tokens + 1e-6 < cost:
+            self.rejected += 1
+            return
+        self.tokens -= cost
+        self.served.append(name)
+
+
+async def test_budget_keeps_within_rate_limit(hass: HomeAssistant) -> None:
+    """Test a burst of prioritized requests is never rejected by the API."""
+    api = FakeRateLimitedApi(CAPACITY, PER_MINUTE)
+    budget = KiddeRateBudget(hass, CAPACITY, PER_MINUTE)
+
+    async def request(name: str, priority: KiddePriority) -> None:
+        await budget.acquire(priority)
+        await api.request(name)
+
+    requests = [
+        request(f"{priority.name.lower()}_{i}", priority)
+        for i in range(8)
+        for priority in (KiddePriority.BACKGROUND, KiddePriority.POLL)
+    ]
+    requests += [request(f"urgent_{i}", KiddePriority.URGENT) for i in range(4)]
+    await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+    budget.async_shutdown()
+
+    assert api.rejected == 0
+    assert len(api.served) == 20
+    # Deferred requests are served most urgent first
+    deferred = api.served[CAPACITY:]
+    priorities = [name.split("_")[0] for name in deferred]
+    assert priorities == sorted(priorities, key=lambda name: KiddePriority[name.upper()])
+
+
+async def test_urgent_not_delayed_by_costly_poll(hass: HomeAssistant) -> None:
+    """Test an urgent request waits for its own cost, not a deferred poll's."""
+    budget = KiddeRateBudget(hass, CAPACITY, PER_MINUTE)
+    await budget.acquire(KiddePriority.POLL, CAPACITY)
+
+    start = time.monotonic()
+    poll = hass.async_create_task(budget.acquire(KiddePriority.POLL, CAPACITY))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(budget.acquire(KiddePriority.URGENT), timeout=1)
+    elapsed = time.monotonic() - start
+
+    # One token refills in 0.05 s, while the poll needs 0.25 s
+    assert elapsed < 0.15
+    assert not poll.done()
+    await asyncio.wait_for(poll, timeout=1)
+    budget.async_shutdown()
@@ -0,0 +1,189 @@
+"""Tests for the Kidde HomeSafe sensors."""
+
+import gc
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
+    UnitOfPressure,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.const import CONF_COMPACT_ENTITIES, DOMAIN
+
+from .conftest import FakeKiddeClient, make_device
+
+
+async def test_air_pressure_in_hectopascal(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test a pressure reported in hPa keeps its value and unit."""
+    state = hass.states.get("sensor.detector_11_air_pressure")
+    assert float(state.state) == 1010.2
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == UnitOfPressure.HPA
+
+
+async def test_budget_sensor_writes_throttled(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test refreshes do not each write the API budget sensor's state."""
+    entity_id = "sensor.kidde_homesafe_account_api_budget"
+    writes = []
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        lambda event: (
+            writes.append(event) if event.data["entity_id"] == entity_id else None
+        ),
+    )
+    coordinator = hass.data[DOMAIN][setup_integration.entry_id].coordinators[None]
+    for _ in range(5):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(writes) <= 1
+
+
+async def test_compact_diagnostics_keep_units(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test compact mode keeps the unit and status of measurements."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_COMPACT_ENTITIES: True}
+    )
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    attributes = hass.states.get("sensor.detector_11_diagnostics").attributes
+    assert attributes["iaq_temperature"] == 21.5
+    assert attributes["iaq_temperature_unit"] == UnitOfTemperature.CELSIUS
+    assert attributes["tvoc_status"] == "Moderate"
+
+
+async def test_compact_diagnostics_recorded_attributes(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Test volatile values are not recorded and the SSID is left out."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_COMPACT_ENTITIES: True}
+    )
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    entity_id = "sensor.detector_11_diagnostics"
+
+    def recorded() -> dict:
+        state = hass.states.get(entity_id)
+        unrecorded = state.state_info["unrecorded_attributes"]
+        return {k: v for k, v in state.attributes.items() if k not in unrecorded}
+
+    assert "ssid" not in hass.states.get(entity_id).attributes
+    before = recorded()
+    assert "ap_rssi" not in before
+    assert before["iaq_temperature_unit"] == UnitOfTemperature.CELSIUS
+
+    fake_client.devices[1][0] = make_device(
+        11,
+        1,
+        "wifiiaqdetector",
+        ap_rssi=-60,
+        tvoc={"value": 900.5, "status": "Bad", "Unit": "ppb"},
+    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id].coordinators[None]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).attributes["ap_rssi"] == -60
+    assert recorded() == before
+
+
+def _use_fleet(client: FakeKiddeClient, per_model: int) -> None:
+    """Serve a single location with a number of detectors of each model."""
+    client.devices = {
+        1: [
+            make_device(device_id, 1, model)
+            for device_id, model in enumerate(
+                ["wifiiaqdetector", "cowifidetector", "waterleakdetector"] * per_model,
+                start=100,
+            )
+        ]
+    }
+    client.locations = {1: client.locations[1]}
+
+
+async def _setup_memory(
+    hass: HomeAssistant, entry: MockConfigEntry, client: FakeKiddeClient, compact: bool
+) -> int:
+    """Return the memory kept allocated by setting up the entry in a mode.
+
+    The entry is set up and unloaded first, so the modules, registries and
+    restore state it needs are loaded before measuring.
+    """
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_COMPACT_ENTITIES: compact}
+    )
+    with patch("kidde_homesafe.KiddeClient", return_value=client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            gc.collect()
+            memory = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    return memory
+
+
+async def test_compact_memory(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_client: FakeKiddeClient
+) -> None:
+    """Compare the memory a fleet keeps in full and compact mode."""
+    _use_fleet(fake_client, 10)
+
+    full = await _setup_memory(hass, config_entry, fake_client, compact=False)
+    compact = await _setup_memory(hass, config_entry, fake_client, compact=True)
+
+    # Compact mode keeps 17 of the 39 entities of the three models, and about
+    # 45% of the memory
+    assert compact < full * 0.6
+
+
+@pytest.mark.parametrize(
+    ("compact", "entities"),
+    [
+        # Account sensors, then three each of IAQ, CO and water leak detectors
+        (False, 2 + 3 * (16 + 10 + 13)),
+        (True, 2 + 3 * (5 + 5 + 7)),
+    ],
+)
+async def test_compact_entity_count(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    compact: bool,
+    entities: int,
+) -> None:
+    """Compare the entities created for a fleet in full and compact mode."""
+    _use_fleet(fake_client, 3)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_COMPACT_ENTITIES: compact}
+    )
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert len(hass.states.async_all()) == entities
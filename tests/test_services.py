@@ -0,0 +1,190 @@
+"""Tests for the Kidde HomeSafe services."""
+
+import json
+import zlib
+from datetime import timedelta
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+from types import ModuleType
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import yaml
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.kidde.const import DOMAIN
+from custom_components.kidde.services import (
+    ATTR_DURATION,
+    ATTR_REFRESHES,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRACE,
+)
+from custom_components.kidde.trace import read_trace
+
+from .conftest import FakeKiddeClient, make_device
+
+INTEGRATION = Path(__file__).parent.parent / "custom_components" / DOMAIN
+SIMULATE = Path(__file__).parent.parent / "scripts" / "simulate"
+
+START = 1718336439.0
+TRACE_REFRESHES = 45
+
+
+async def test_services_described(
+    hass: HomeAssistant, setup_integration: MockConfigEntry
+) -> None:
+    """Test every registered service is defined and translated."""
+    services = set(hass.services.async_services()[DOMAIN])
+    definitions = yaml.safe_load((INTEGRATION / "services.yaml").read_text())
+    strings = json.loads((INTEGRATION / "strings.json").read_text())["services"]
+
+    assert services == set(definitions) == set(strings)
+    for service, definition in definitions.items():
+        assert set(definition["fields"]) == set(strings[service]["fields"])
+
+
+def _gzip_members(path: Path) -> int:
+    """Count the gzip members of a file."""
+    data, members = path.read_bytes(), 0
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        decompressor.decompress(data)
+        data = decompressor.unused_data
+        members += 1
+    return members
+
+
+def _load_simulate() -> ModuleType:
+    """Load scripts/simulate, which has no .py extension, as a module."""
+    loader = SourceFileLoader("simulate", str(SIMULATE))
+    module = ModuleType(loader.name)
+    module.__file__ = str(SIMULATE)
+    loader.exec_module(module)
+    return module
+
+
+async def test_record_trace_replay(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    tmp_path: Path,
+) -> None:
+    """Test a trace recorded by the service reads back and replays."""
+    hass.config.config_dir = str(tmp_path)
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    account = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = account.coordinators[None]
+    coordinator.budget.acquire = AsyncMock()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_RECORD_TRACE, {ATTR_DURATION: {"hours": 1}}, blocking=True
+    )
+
+    # Refreshes are recorded a minute apart, and the smoke alarm of a detector
+    # is on from the 12th to the 30th
+    clock = Mock(time=Mock(side_effect=lambda: START + 60 * refresh))
+    with patch("custom_components.kidde.trace.time", clock):
+        for refresh in range(TRACE_REFRESHES):
+            fake_client.devices[1][1] = make_device(
+                12,
+                1,
+                "cowifidetector",
+                ap_rssi=-50 - refresh % 2,
+                smoke_alarm=12 <= refresh < 30,
+            )
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1, minutes=1))
+    await hass.async_block_till_done()
+    assert account._trace is None
+
+    # Refreshes are written every TRACE_FLUSH_LINES lines, each a gzip member
+    (path,) = tmp_path.glob("kidde_trace_*.jsonl.gz")
+    assert _gzip_members(path) > 2
+    header, refreshes = read_trace(path)
+    assert header["locations"] == 2
+    assert header["update_interval"] == 60
+    refreshes = list(refreshes)[:TRACE_REFRESHES]
+    assert [refresh["t"] for refresh in refreshes] == [
+        START + 60 * refresh for refresh in range(TRACE_REFRESHES)
+    ]
+    assert set(refreshes[0]["d"]) == {"11", "12", "21"}
+    assert refreshes[0]["d"]["12"]["ssid"] == REDACTED
+    assert all(set(refresh["d"]) == {"12"} for refresh in refreshes[1:])
+
+    simulate = _load_simulate()
+    header, events, end = simulate.load(path)
+    every_minute = simulate.replay(simulate.FixedPolicy("60"), events, end, 0.0)
+    assert every_minute["latencies"] == [0.0]
+    assert every_minute["missed"] == 0
+    every_five_minutes = simulate.replay(simulate.FixedPolicy("300"), events, end, 0.0)
+    assert every_five_minutes["latencies"] == [180.0]
+    assert every_five_minutes["polls"] < every_minute["polls"]
+
+
+async def test_profile_writes_report(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    tmp_path: Path,
+) -> None:
+    """Test the profile service writes a report and detaches the profiler."""
+    hass.config.config_dir = str(tmp_path)
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    account = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = account.coordinators[None]
+    coordinator.budget.acquire = AsyncMock()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE, {ATTR_REFRESHES: 2}, blocking=True
+    )
+    path = account.profile_path
+    assert coordinator.profiler is not None
+    for _ in range(2):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert account.profile_path is None
+    assert coordinator.profiler is None
+    report = path.read_text(encoding="utf-8")
+    assert report.startswith("Kidde HomeSafe profile of 2 refreshes")
+    assert "_async_update_data" in report
+
+
+async def test_profile_busy_account(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_client: FakeKiddeClient,
+    tmp_path: Path,
+) -> None:
+    """Test no account starts profiling while another one already is."""
+    hass.config.config_dir = str(tmp_path)
+    other_entry = MockConfigEntry(domain=DOMAIN, data=config_entry.data)
+    other_entry.add_to_hass(hass)
+    with patch("kidde_homesafe.KiddeClient", return_value=fake_client):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    # The busy account comes after the other, so it is not the first checked
+    other = hass.data[DOMAIN][config_entry.entry_id]
+    busy = hass.data[DOMAIN][other_entry.entry_id]
+    path = busy.async_profile(5)
+
+    with pytest.raises(HomeAssistantError, match=str(path)):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {}, blocking=True)
+
+    assert busy.profile_path == path
+    assert other.profile_path is None
+    assert all(
+        coordinator.profiler is None for coordinator in other.coordinators.values()
+    )
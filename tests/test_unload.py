@@ -0,0 +1,141 @@
+"""Reload regression harness for the Kidde HomeSafe integration.
+
+Sets up and unloads the integration many times against the fake client, and
+fails if anything the account holds survives an unload or memory grows.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gc
+import logging
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kidde.account import KiddeAccount
+from custom_components.kidde.const import CONF_SHARD_LOCATIONS, DOMAIN
+from custom_components.kidde.coordinator import KiddeCoordinator
+from custom_components.kidde.entity import KiddeAccountEntity, KiddeEntity
+from custom_components.kidde.ratelimit import KiddeRateBudget
+
+from .conftest import FakeKiddeClient
+
+WARMUP_CYCLES = 20
+CYCLES = 300
+# Tracing memory is much slower, so fewer cycles are traced
+MEMORY_CYCLES = 25
+TRACEBACK_FRAMES = 3
+# Allowed growth per cycle after warming up. A leaked account keeps hundreds of
+# objects and tens of kilobytes, while Home Assistant keeps every unloaded entity
+# platform in hass.data, which is a few objects per cycle.
+MAX_OBJECT_GROWTH_PER_CYCLE = 10
+MAX_MEMORY_GROWTH_PER_CYCLE = 256
+# Memory allocated with the integration's code on the stack
+OWN_CODE = [tracemalloc.Filter(True, "*/custom_components/kidde/*", all_frames=True)]
+
+TRACKED_TYPES = (
+    KiddeAccount,
+    KiddeCoordinator,
+    KiddeRateBudget,
+    KiddeEntity,
+    KiddeAccountEntity,
+    FakeKiddeClient,
+)
+
+
+def _tracked_counts() -> Counter[str]:
+    """Count the live instances of the integration's classes."""
+    return Counter(
+        type(obj).__name__ for obj in gc.get_objects() if isinstance(obj, TRACKED_TYPES)
+    )
+
+
+async def _cycle(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set up the entry, start a trace and a profile, then unload it."""
+    with patch("kidde_homesafe.KiddeClient", FakeKiddeClient):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+
+    account: KiddeAccount = hass.data[DOMAIN][entry.entry_id]
+    await account.async_record_trace(dt.timedelta(hours=1))
+    account.async_profile(5)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    _assert_released(hass, entry, account)
+    # Mocked storage records every call, holding on to each Store created
+    for mock in (Store._async_load, Store._async_write_data, Store.async_remove):
+        mock.reset_mock()
+
+
+def _assert_released(
+    hass: HomeAssistant, entry: MockConfigEntry, account: KiddeAccount
+) -> None:
+    """Assert an unloaded account holds no listeners, timers or recorders."""
+    assert entry.entry_id not in hass.data[DOMAIN]
+    assert not account._entity_factories
+    assert not account._entities
+    assert not account._unsub_coordinators
+    assert account._cancel_location_refresh is None
+    assert account._trace is None
+    assert account._cancel_trace is None
+    assert account._profiler is None
+    assert account.budget._timer is None
+    assert not account.budget._waiters
+    assert not account.budget._listeners
+    assert not account.alarm_latency._listeners
+    for coordinator in account.coordinators.values():
+        assert not coordinator._listeners
+        assert coordinator._unsub_refresh is None
+        assert coordinator.trace is None
+        assert coordinator.profiler is None
+
+
+@pytest.mark.parametrize("shard", [False, True])
+async def test_reload_releases_everything(
+    hass: HomeAssistant, config_entry: MockConfigEntry, tmp_path: Path, shard: bool
+) -> None:
+    """Test repeated setup and unload does not grow objects or memory."""
+    hass.config.config_dir = str(tmp_path)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_SHARD_LOCATIONS: shard}
+    )
+    # Captured log records would otherwise be the largest growth
+    logging.disable(logging.INFO)
+    try:
+        for _ in range(WARMUP_CYCLES):
+            await _cycle(hass, config_entry)
+
+        gc.collect()
+        tracked = _tracked_counts()
+        objects = len(gc.get_objects())
+        for _ in range(CYCLES):
+            await _cycle(hass, config_entry)
+        gc.collect()
+        assert _tracked_counts() == tracked
+        assert len(gc.get_objects()) - objects < MAX_OBJECT_GROWTH_PER_CYCLE * CYCLES
+
+        tracemalloc.start(TRACEBACK_FRAMES)
+        try:
+            before = tracemalloc.take_snapshot().filter_traces(OWN_CODE)
+            for _ in range(MEMORY_CYCLES):
+                await _cycle(hass, config_entry)
+            gc.collect()
+            after = tracemalloc.take_snapshot().filter_traces(OWN_CODE)
+        finally:
+            tracemalloc.stop()
+    finally:
+        logging.disable(logging.NOTSET)
+
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    assert growth < MAX_MEMORY_GROWTH_PER_CYCLE * MEMORY_CYCLES